@@ -0,0 +1,40 @@
+"""Add trigram indexes for tag search
+
+Revision ID: 3e9b5c2d6f10
+Revises: 8c2d4f1a7b3e
+Create Date: 2022-08-27 14:03:22.518930
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3e9b5c2d6f10'
+down_revision = '8c2d4f1a7b3e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE OR REPLACE FUNCTION tag_aliases_text(aliases text[]) RETURNS text "
+        "LANGUAGE sql IMMUTABLE AS $$ SELECT array_to_string(aliases, ' ') $$"
+    )
+    with op.get_context().autocommit_block():
+        # A failed concurrent build leaves an invalid index behind, which would make the upgrade fail when retried
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_tags_name_trgm')
+        op.create_index(
+            'ix_tags_name_trgm', 'Tags', ['name'],
+            postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+            postgresql_concurrently=True
+        )
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_tags_aliases_trgm')
+        op.execute("CREATE INDEX CONCURRENTLY ix_tags_aliases_trgm ON \"Tags\" USING gin (tag_aliases_text(aliases) gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tags_aliases_trgm', table_name='Tags', postgresql_concurrently=True)
+        op.drop_index('ix_tags_name_trgm', table_name='Tags', postgresql_concurrently=True)
+    op.execute("DROP FUNCTION IF EXISTS tag_aliases_text(text[])")
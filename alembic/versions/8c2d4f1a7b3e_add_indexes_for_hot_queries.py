@@ -0,0 +1,59 @@
+"""Add indexes for punishment, tag and linked account queries
+
+Revision ID: 8c2d4f1a7b3e
+Revises: d701f9500009
+Create Date: 2022-08-24 18:12:51.307214
+
+"""
+from alembic import op
+import logging
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c2d4f1a7b3e'
+down_revision = 'd701f9500009'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# Indexes built by this revision, concurrently so that the tables stay writable while the bot is running
+INDEXES = [
+    ('ix_punishments_guild_id_case_id', 'Punishments', ['guild_id', 'case_id'], {}),
+    ('ix_punishments_guild_id_user_id_issue_date', 'Punishments', ['guild_id', 'user_id', 'issue_date'], {}),
+    ('ix_punishments_guild_id_user_id_type', 'Punishments', ['guild_id', 'user_id', 'type'], {}),
+    ('ix_punishments_guild_id_moderator_id', 'Punishments', ['guild_id', 'moderator_id'], {}),
+    (
+        'ix_punishments_pending_expiration', 'Punishments', ['expire_date'],
+        {'postgresql_where': sa.text('handled = false AND expire_date IS NOT NULL')}
+    ),
+    ('ix_tags_guild_id_lower_name', 'Tags', ['guild_id', sa.text('lower(name)')], {}),
+    ('ix_linked_accounts_user_id', 'LinkedAccounts', ['user_id'], {'unique': True}),
+    ('ix_linked_accounts_forum_id', 'LinkedAccounts', ['forum_id'], {'unique': True}),
+]
+
+
+def upgrade() -> None:
+    # WARNING: duplicate account links are deleted, keeping only the oldest link of every user and forum account,
+    # so that both IDs can be unique. Every deleted link is logged, so that it can be restored by hand if needed
+    for column in ('user_id', 'forum_id'):
+        deleted = op.get_bind().execute(sa.text(
+            'DELETE FROM "LinkedAccounts" AS a USING "LinkedAccounts" AS b '
+            f'WHERE a.{column} = b.{column} AND a.id > b.id '
+            'RETURNING a.id, a.user_id, a.forum_id'
+        )).fetchall()
+        for row in deleted:
+            logger.warning(f"Deleted duplicate linked account #{row.id} of user {row.user_id} and forum account {row.forum_id}")
+
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            # A failed concurrent build leaves an invalid index behind, which would make the upgrade fail when retried
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+            op.create_index(name, table, columns, postgresql_concurrently=True, **kwargs)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
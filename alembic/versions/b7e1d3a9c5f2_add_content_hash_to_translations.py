@@ -0,0 +1,34 @@
+"""Add content hash to translations
+
+Revision ID: b7e1d3a9c5f2
+Revises: 3e9b5c2d6f10
+Create Date: 2022-08-29 11:47:09.183305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e1d3a9c5f2'
+down_revision = '3e9b5c2d6f10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('Translations', sa.Column('content_hash', sa.String(length=32), nullable=True))
+    op.execute('DELETE FROM "Translations" WHERE original_content IS NULL')
+    op.execute('UPDATE "Translations" SET content_hash = md5(original_content)')
+    # Keep only the oldest translation of every string, so that the hash can be unique
+    op.execute(
+        'DELETE FROM "Translations" AS a USING "Translations" AS b '
+        'WHERE a.content_hash = b.content_hash AND a.id > b.id'
+    )
+    op.alter_column('Translations', 'content_hash', nullable=False)
+    op.create_index('ix_translations_content_hash', 'Translations', ['content_hash'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_translations_content_hash', table_name='Translations')
+    op.drop_column('Translations', 'content_hash')
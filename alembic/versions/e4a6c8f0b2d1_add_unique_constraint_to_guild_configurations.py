@@ -0,0 +1,28 @@
+"""Add unique constraint to guild configurations
+
+Revision ID: e4a6c8f0b2d1
+Revises: b7e1d3a9c5f2
+Create Date: 2022-09-01 19:25:40.662018
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a6c8f0b2d1'
+down_revision = 'b7e1d3a9c5f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep only the oldest configuration of every guild, so that the guild ID can be unique
+    op.execute(
+        'DELETE FROM "GuildConfigurations" AS a USING "GuildConfigurations" AS b '
+        'WHERE a.guild_id = b.guild_id AND a.id > b.id'
+    )
+    op.create_unique_constraint('GuildConfigurations_guild_id_key', 'GuildConfigurations', ['guild_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('GuildConfigurations_guild_id_key', 'GuildConfigurations', type_='unique')
@@ -24,6 +24,9 @@ from pidroid.cogs.utils.aliases import GuildChannel
 from pidroid.cogs.utils.api import API
 from pidroid.cogs.utils.checks import is_client_development
 from pidroid.cogs.utils.data import PersistentDataManager
+from pidroid.cogs.utils.file import ResourceCache
+from pidroid.cogs.utils.help import CommandIndex
+from pidroid.cogs.utils.http import OutboundStatistics
 from pidroid.cogs.utils.logger import BaseLog
 
 class VersionInfo(NamedTuple):
@@ -111,10 +114,13 @@ class Pidroid(commands.Bot): # type: ignore
         # This holds cached guild configurations
         self._guild_config_ready = asyncio.Event()
         self._cached_configurations: Dict[int, GuildConfiguration] = {}
+        # Guild configurations which are currently being loaded on demand
+        self._loading_configurations: Dict[int, asyncio.Task] = {}
 
         self.client_version = __VERSION__
 
         self.command_categories = get_command_categories()
+        self.command_index = CommandIndex([], self.command_categories)
 
         self.version_cache: Dict[str, Optional[str]] = {}
 
@@ -122,17 +128,27 @@ class Pidroid(commands.Bot): # type: ignore
         self.prefixes = self.config['prefixes']
 
         self.session = None
+        self.outbound_statistics = OutboundStatistics()
 
         self.api = API(self, self.config["postgres_dsn"], False)
 
-        self.persistent_data = PersistentDataManager()
+        self.persistent_data = PersistentDataManager(journal=True)
+
+        self.resource_cache = ResourceCache()
 
         self.setup_logging(logging.DEBUG)
 
     async def setup_hook(self):
+        await self.persistent_data.load()
         await self.api.connect()
+        await self.api.warm_up_pool(self.config.get("postgres_pool_warmup", 0))
         await self.load_cogs()
 
+    async def close(self):
+        await self.persistent_data.close()
+        await super().close()
+        await self.api.close()
+
     @property
     def token(self) -> str:
         """Returns client token."""
@@ -153,10 +169,12 @@ class Pidroid(commands.Bot): # type: ignore
         return f"{version_str} {self.client_version.releaselevel} {self.client_version.commit_id}"
 
     async def wait_guild_config_cache_ready(self):
-        """Waits until the internal guild configuration cache is ready.
+        """Waits until configurations of all guilds are loaded to the internal guild configuration cache.
 
         It also waits for internal bot cache to be ready, therefore calling client.wait_until_ready()
         is no longer needed.
+
+        Prefer fetch_guild_configuration when only a single guild configuration is required.
         """
         await self._guild_config_ready.wait()
 
@@ -177,12 +195,40 @@ class Pidroid(commands.Bot): # type: ignore
             self.logger.error(f"Failure acquiring guild configuration for {guild_id}")
         return config
 
+    async def fetch_guild_configuration(self, guild_id: int) -> GuildConfiguration:
+        """Returns guild configuration for specified guild.
+
+        If the configuration is not cached yet, it is loaded from the database
+        or created, if the guild does not have one."""
+        config = self.guild_configurations.get(guild_id)
+        if config is not None:
+            return config
+
+        task = self._loading_configurations.get(guild_id)
+        if task is None:
+            task = self.loop.create_task(self._load_guild_configuration(guild_id))
+            self._loading_configurations[guild_id] = task
+        # Shielded, as other callers may be waiting for the same task
+        return await asyncio.shield(task)
+
+    async def _load_guild_configuration(self, guild_id: int) -> GuildConfiguration:
+        try:
+            config = await self.api.fetch_guild_configuration(guild_id)
+            if config is None:
+                created = await self.api.insert_guild_configurations([guild_id])
+                # Another process could have created the configuration in the meantime
+                config = created[0] if created else await self.api.fetch_guild_configuration(guild_id)
+                assert config is not None
+            return self._update_guild_configuration(guild_id, config)
+        finally:
+            del self._loading_configurations[guild_id]
+
     def _update_guild_configuration(self, guild_id: int, config: GuildConfiguration) -> GuildConfiguration:
         self.guild_configurations[guild_id] = config
         return self.get_guild_configuration(guild_id) # type: ignore
 
     def _remove_guild_configuration(self, guild_id: int) -> None:
-        self.guild_configurations.pop(guild_id)
+        self.guild_configurations.pop(guild_id, None)
 
     async def create_expiring_thread(self, message: Message, name: str, expire_timestamp: datetime.datetime, auto_archive_duration: int = 60):
         """Creates a new expiring thread"""
@@ -279,17 +325,26 @@ class Pidroid(commands.Bot): # type: ignore
 
     async def get_prefix(self, message: Message):
         """Returns a prefix for client to respond to."""
-        await self.wait_guild_config_cache_ready()
+        # Only the configuration of the message's guild is required for its commands to be processed
+        if message.guild:
+            await self.fetch_guild_configuration(message.guild.id)
         return commands.when_mentioned_or(*self.get_prefixes(message))(self, message) # type: ignore
 
     async def handle_reload(self):
         """Reloads all cogs of the client, excluding DB and API extensions.
         \nWarning: this is an experimental method and should not be depended on!"""
         self.logger.critical("Reloading bot configuration data and all cogs")
-        for ext in self.extensions_to_load:
-            await self.unload_extension(ext)
-        for ext in self.extensions_to_load:
-            await self.load_extension(ext)
+        try:
+            for ext in self.extensions_to_load:
+                await self.unload_extension(ext)
+            for ext in self.extensions_to_load:
+                await self.load_extension(ext)
+        finally:
+            self.rebuild_command_index()
+
+    def rebuild_command_index(self) -> None:
+        """Rebuilds the command index used by the help command from the currently loaded commands."""
+        self.command_index = CommandIndex(self.walk_commands(), self.command_categories)
 
     async def load_all_extensions(self):
         """Attempts to load all extensions as defined in client object."""
@@ -305,6 +360,7 @@ class Pidroid(commands.Bot): # type: ignore
         """Attempts to load all extensions as defined in client object."""
         self.logger.info("Starting the bot")
         await self.load_all_extensions()
+        self.rebuild_command_index()
 
     async def annoy_erksmit(self):
         if sys.platform != "win32":
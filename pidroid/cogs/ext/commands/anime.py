@@ -16,7 +16,6 @@ from pidroid.cogs.utils.paginators import ListPageSource, PidroidPages
 from pidroid.cogs.utils.parsers import truncate_string
 from pidroid.cogs.models.categories import RandomCategory
 from pidroid.cogs.models.exceptions import APIException
-from pidroid.cogs.utils.file import Resource
 from pidroid.cogs.models.waifulistapi import MyWaifuListAPI, Waifu, WaifuSearchResult
 
 NEKO_API = "https://nekos.life/api/v2"
@@ -95,7 +94,10 @@ class AnimeCommands(commands.Cog): # type: ignore
 
     def __init__(self, client):
         self.client = client
-        self.waifu_list_api = MyWaifuListAPI()
+        self.waifu_list_api = MyWaifuListAPI(self.client.session)
+
+    async def cog_load(self):
+        await self.client.resource_cache.preload('you_were_banned.mp4')
 
     @commands.command( # type: ignore
         brief='Don\'t ask.',
@@ -106,7 +108,7 @@ class AnimeCommands(commands.Cog): # type: ignore
     @commands.bot_has_permissions(send_messages=True, attach_files=True) # type: ignore
     async def yourebanned(self, ctx: Context):
         async with ctx.typing():
-            await ctx.reply(file=discord.File(Resource('you_were_banned.mp4')))
+            await self.client.resource_cache.send(ctx.reply, 'you_were_banned.mp4')
 
     @commands.group( # type: ignore
         category=RandomCategory,
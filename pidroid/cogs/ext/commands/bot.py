@@ -76,6 +76,8 @@ class BotCommands(commands.Cog): # type: ignore
 
             if mode == "extended" and await self.client.is_owner(ctx.author): # type: ignore
                 total_memory = round(psutil.virtual_memory().total / 1024 / 1024, 2)
+                pool_status = self.client.api.get_pool_status()
+                hit_rate = pool_status["statement_hit_rate"]
                 extended_message = (
                     f'```{self.client.user.name} ({self.client.user.id}) build {version} information\n\n'
                     f'* The bot (PID {process_id}) is running on {process.num_threads()}'
@@ -86,7 +88,10 @@ class BotCommands(commands.Cog): # type: ignore
                     f'* Bot uptime: {uptime} started on {timestamp_to_date(int(start_time), "hybrid")}\n'
                     f'* Owner: {owner_name} ({owner_id})\n'
                     f'* CPU usage: {process.cpu_percent(interval=1.0)}%\n'
-                    f'* RAM usage: {used_memory}/{total_memory} MB ({round(process.memory_percent(), 2)}%)```'
+                    f'* RAM usage: {used_memory}/{total_memory} MB ({round(process.memory_percent(), 2)}%)\n'
+                    f'* Database pool: {pool_status["checked_out"]}/{pool_status["size"]} connections checked out'
+                    f' ({pool_status["overflow"]} overflow), average wait {pool_status["average_wait"] * 1000:.2f}ms,'
+                    f' statement cache hit rate {"N/A" if hit_rate is None else f"{hit_rate:.1%}"}```'
                 )
                 return await ctx.reply(extended_message)
 
@@ -29,11 +29,11 @@ CLOAKER_LINES = [
 ]
 
 PINGU_RESPONSES = [
-    ('Ooga booga', Resource('pingutroll.gif')),
-    ('I can\'t read lol', Resource('pinguread.gif')),
-    ('NOOT NOOT!', Resource('pingunoot.gif')),
-    ('Spotify premium be like:', Resource('pingumusic.gif')),
-    ('NOOT NOOT',  Resource('pingu.png'))
+    ('Ooga booga', 'pingutroll.gif'),
+    ('I can\'t read lol', 'pinguread.gif'),
+    ('NOOT NOOT!', 'pingunoot.gif'),
+    ('Spotify premium be like:', 'pingumusic.gif'),
+    ('NOOT NOOT',  'pingu.png')
 ]
 
 def colour_from_hex(hex_str: str) -> Colour:
@@ -57,6 +57,11 @@ class FunCommands(commands.Cog): # type: ignore
     def __init__(self, client: Pidroid) -> None:
         self.client = client
 
+    async def cog_load(self):
+        await self.client.resource_cache.preload(
+            *[name for _, name in PINGU_RESPONSES], 'sloth.gif', 'evan.png'
+        )
+
     @property
     def tenor_token(self) -> str:
         """Returns TENOR GIF API token."""
@@ -90,8 +95,8 @@ class FunCommands(commands.Cog): # type: ignore
     @commands.bot_has_permissions(send_messages=True, attach_files=True) # type: ignore
     async def pingu(self, ctx: Context):
         async with ctx.typing():
-            text, file_path = random.choice(PINGU_RESPONSES) # nosec
-            await ctx.reply(text, file=discord.File(file_path))
+            text, name = random.choice(PINGU_RESPONSES) # nosec
+            await self.client.resource_cache.send(ctx.reply, name, text)
 
     @commands.command( # type: ignore
         brief='Summons a very slow creature.',
@@ -100,7 +105,10 @@ class FunCommands(commands.Cog): # type: ignore
     @commands.bot_has_permissions(send_messages=True, attach_files=True) # type: ignore
     async def sloth(self, ctx: Context):
         async with ctx.typing():
-            await ctx.reply(content="M m m m m  y e s . . .\nGIF file loads as fast as what is about to load in.", file=discord.File(Resource('sloth.gif')))
+            await self.client.resource_cache.send(
+                ctx.reply, 'sloth.gif',
+                "M m m m m  y e s . . .\nGIF file loads as fast as what is about to load in."
+            )
 
     @commands.command( # type: ignore
         brief='Returns a positive review from TheoTown listing on play store.',
@@ -126,10 +134,10 @@ class FunCommands(commands.Cog): # type: ignore
     @commands.bot_has_permissions(send_messages=True, attach_files=True) # type: ignore
     async def fire(self, ctx: Context):
         async with ctx.typing():
-            await ctx.reply(
-                content="There's a fire somewhere? Call <@326167365677219840> to the rescue!",
-                allowed_mentions=AllowedMentions(users=False),
-                file=discord.File(Resource('evan.png'))
+            await self.client.resource_cache.send(
+                ctx.reply, 'evan.png',
+                "There's a fire somewhere? Call <@326167365677219840> to the rescue!",
+                allowed_mentions=AllowedMentions(users=False)
             )
 
     @commands.command( # type: ignore
@@ -5,32 +5,20 @@ from discord.ext import commands # type: ignore
 from discord.ext.commands.context import Context # type: ignore
 from discord.ext.commands.errors import BadArgument # type: ignore
 from io import BytesIO
-from PIL import Image # type: ignore
-from PIL import ImageFont
-from PIL import ImageDraw
 from typing import Tuple
 
 from pidroid.client import Pidroid
 from pidroid.cogs.models.categories import RandomCategory
 from pidroid.cogs.utils import http
 from pidroid.cogs.utils.embeds import ErrorEmbed
-from pidroid.cogs.utils.file import Resource
+from pidroid.cogs.utils.images import ImageWorker, render_bonk, render_hank, render_memefy
 
-COMIC_FONT_PATH = Resource("COMIC.TTF")
 
-def draw_text_with_border(draw, x, y, text, font, text_colour='white', border_colour='black') -> None:
-    """Draws text with borders."""
-    # Borders
-    draw.text((x - 1, y - 1), text, font=font, fill=border_colour)
-    draw.text((x + 1, y - 1), text, font=font, fill=border_colour)
-    draw.text((x - 1, y + 1), text, font=font, fill=border_colour)
-    draw.text((x + 1, y + 1), text, font=font, fill=border_colour)
-    # The actual text
-    draw.text((x, y), text, font=font, fill=text_colour)
+# Maximum size of an image attachment in bytes
+MAX_ATTACHMENT_SIZE = 7_000_000
 
-
-async def handle_attachment(ctx: Context) -> Tuple[discord.Attachment, str]:
-    """Returns None or discord.Attachment after assuring it is safe to use."""
+async def load_attachment(ctx: Context) -> Tuple[bytes, str]:
+    """Returns the contents and the extension of the first message attachment after assuring it is safe to use."""
     attachments = ctx.message.attachments
     if len(attachments) < 1:
         raise BadArgument('I could not find any attachments!')
@@ -42,10 +30,12 @@ async def handle_attachment(ctx: Context) -> Tuple[discord.Attachment, str]:
     if extension.lower() not in ['.png', '.jpg', '.jpeg']:
         raise BadArgument('Unsupported file extension. Only image files of .png, .jpg and .jpeg extensions are supported!')
 
-    if attachment.size >= 7000000:
-        raise BadArgument('Your image is too big! Please upload images below 7 MBs')
+    # Oversized attachments are rejected before downloading anything
+    if attachment.size > MAX_ATTACHMENT_SIZE:
+        raise BadArgument(f'Your image is too big! Please upload images below {MAX_ATTACHMENT_SIZE // 1_000_000} MBs')
 
-    return attachment, extension
+    payload = await http.read_limited(ctx.bot, attachment.url, MAX_ATTACHMENT_SIZE)
+    return payload, extension
 
 
 class ImageManipCommands(commands.Cog): # type: ignore
@@ -53,6 +43,11 @@ class ImageManipCommands(commands.Cog): # type: ignore
 
     def __init__(self, client):
         self.client = client
+        self.worker = ImageWorker()
+
+    def cog_unload(self):
+        """Ensure that worker processes are shut down on cog unload."""
+        self.worker.close()
 
     @commands.command( # type: ignore
         brief='Bonks the specified member.',
@@ -68,20 +63,8 @@ class ImageManipCommands(commands.Cog): # type: ignore
             raise BadArgument("Please specify a member which you want to bonk!")
 
         async with ctx.channel.typing():
-            output_file = BytesIO()
-            img = Image.open(Resource('bonk.jpg'))
-            draw = ImageDraw.Draw(img)
-            font = ImageFont.truetype(COMIC_FONT_PATH, 14)
-            # Target
-            draw_text_with_border(draw, 165, 140, member.display_name, font)
-            # Issuer of command
-            draw_text_with_border(draw, 7, 43, ctx.author.display_name, font)
-
-            img.save(output_file, format='png')
-            img.close()
-            output_file.seek(0)
-            await ctx.reply(content=member.mention, file=discord.File(output_file, filename='image.png'))
-        output_file.close()
+            image = await self.worker.render(render_bonk, member.display_name, ctx.author.display_name)
+            await ctx.reply(content=member.mention, file=discord.File(BytesIO(image), filename='image.png'))
 
     @commands.command( # type: ignore
         brief='Updates meme uploaded as attachment to comply within the German copyright regulations.',
@@ -93,27 +76,12 @@ class ImageManipCommands(commands.Cog): # type: ignore
     @commands.max_concurrency(number=1, per=commands.BucketType.user) # type: ignore
     async def memefy(self, ctx: Context, retain_aspect: bool = False):
         async with ctx.channel.typing():
-            attachment, extension = await handle_attachment(ctx)
-
-            output_file = BytesIO()
-            async with await http.get(self.client, attachment.url) as r:
-                payload = await r.read()
-            input_file = BytesIO(payload)
-            img = Image.open(input_file)
-            sizes = (128, 128)
-            if retain_aspect:
-                orig_w, orig_h = img.size
-                sizes = (128, round(orig_w * 128 / orig_h))
-            img = img.resize(sizes, Image.ANTIALIAS)
-            img.save(output_file, format='png')
-            img.close()
-            input_file.close()
-            output_file.seek(0)
+            payload, extension = await load_attachment(ctx)
+            image = await self.worker.render(render_memefy, payload, retain_aspect)
             await ctx.reply(
                 content='Meme has been updated to comply within German regulations.',
-                file=discord.File(output_file, filename=f'image{extension}')
+                file=discord.File(BytesIO(image), filename=f'image{extension}')
             )
-        output_file.close()
 
     @commands.command( # type: ignore
         brief='Upscales image to 4k resolution.',
@@ -126,8 +94,6 @@ class ImageManipCommands(commands.Cog): # type: ignore
     @commands.max_concurrency(number=1, per=commands.BucketType.user) # type: ignore
     async def hank(self, ctx: Context, quality: int = 1):
         async with ctx.channel.typing():
-            attachment, _ = await handle_attachment(ctx)
-
             if quality < 1:
                 await ctx.reply(embed=ErrorEmbed('Quality must be a positive number!'))
                 return
@@ -136,19 +102,9 @@ class ImageManipCommands(commands.Cog): # type: ignore
                 await ctx.reply(embed=ErrorEmbed('Quality must be 10 or less!'))
                 return
 
-            async with await http.get(self.client, attachment.url) as r:
-                payload = await r.read()
-            input_file = BytesIO(payload)
-
-            img = Image.open(input_file)
-            img = img.convert("RGB")
-            b = BytesIO()
-            img.save(b, format='JPEG', quality=quality)
-            img.close()
-            input_file.close()
-            b.seek(0)
-            await ctx.reply(content='Do I look like I know what a JPEG is?', file=discord.File(b, filename='compression.jpg'))
-        b.close()
+            payload, _ = await load_attachment(ctx)
+            image = await self.worker.render(render_hank, payload, quality)
+            await ctx.reply(content='Do I look like I know what a JPEG is?', file=discord.File(BytesIO(image), filename='compression.jpg'))
 
 
 async def setup(client: Pidroid):
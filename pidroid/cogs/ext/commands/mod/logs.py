@@ -5,7 +5,7 @@ from discord.ext.commands.context import Context # type: ignore
 from typing import Optional, Union
 
 from pidroid.client import Pidroid
-from pidroid.cogs.models.case import CasePaginator
+from pidroid.cogs.models.case import CasePageSource
 from pidroid.cogs.models.categories import ModerationCategory
 from pidroid.cogs.utils.checks import check_junior_moderator_permissions, check_normal_moderator_permissions
 from pidroid.cogs.utils.decorators import command_checks
@@ -71,16 +71,18 @@ class ModeratorInfoCommands(commands.Cog): # type: ignore
             check_junior_moderator_permissions(ctx, kick_members=True)
             error_msg = "Specified user has no warnings."
 
-        if amount.lower() == 'all':
-            warnings = await self.client.fetch_warnings(ctx.guild.id, user.id)
-        else:
-            warnings = await self.client.fetch_active_warnings(ctx.guild.id, user.id)
+        active_only = amount.lower() != 'all'
+        warning_count = await self.client.api.count_cases(ctx.guild.id, user.id, warnings_only=True, active_only=active_only)
 
-        if len(warnings) == 0:
+        if warning_count == 0:
             return await ctx.reply(embed=ErrorEmbed(error_msg))
 
         pages = PidroidPages(
-            source=CasePaginator(f"Displaying warnings for {str(user)}", warnings, True),
+            source=CasePageSource(
+                self.client.api, f"Displaying warnings for {str(user)}",
+                ctx.guild.id, user.id, warning_count, compact=True,
+                warnings_only=True, active_only=active_only
+            ),
             ctx=ctx
         )
         await pages.start()
@@ -101,13 +103,16 @@ class ModeratorInfoCommands(commands.Cog): # type: ignore
             check_junior_moderator_permissions(ctx, kick_members=True)
             error_msg = "Specified user has no modlogs!"
 
-        cases = await self.client.fetch_cases(ctx.guild.id, user.id)
+        case_count = await self.client.api.count_cases(ctx.guild.id, user.id)
 
-        if len(cases) == 0:
+        if case_count == 0:
             return await ctx.reply(embed=ErrorEmbed(error_msg))
 
         pages = PidroidPages(
-            source=CasePaginator(f"Displaying moderation logs for {str(user)}", cases),
+            source=CasePageSource(
+                self.client.api, f"Displaying moderation logs for {str(user)}",
+                ctx.guild.id, user.id, case_count
+            ),
             ctx=ctx
         )
         await pages.start()
@@ -14,7 +14,7 @@ from pidroid.client import Pidroid
 from pidroid.constants import JUSTANYONE_ID
 from pidroid.cogs.models.categories import OwnerCategory
 from pidroid.cogs.utils.decorators import command_checks
-from pidroid.cogs.utils.embeds import ErrorEmbed
+from pidroid.cogs.utils.embeds import ErrorEmbed, PidroidEmbed
 
 if TYPE_CHECKING:
     from pidroid.cogs.ext.events.initialization import InvocationEventHandler
@@ -103,5 +103,81 @@ class OwnerCommands(commands.Cog): # type: ignore
         await cog._fill_guild_config_cache()
         await ctx.reply("Internal guild cache updated!")
 
+    @commands.command( # type: ignore
+        name="pool-stats",
+        brief="Displays database connection pool statistics.",
+        aliases=["poolstats"],
+        category=OwnerCategory
+    )
+    @commands.is_owner() # type: ignore
+    @commands.bot_has_permissions(send_messages=True) # type: ignore
+    async def poolstats(self, ctx: Context):
+        status = self.client.api.get_pool_status()
+        hit_rate = status["statement_hit_rate"]
+
+        embed = PidroidEmbed(title="Database connection pool statistics")
+        embed.add_field(name="Pool size", value=status["size"])
+        embed.add_field(name="Checked out", value=status["checked_out"])
+        embed.add_field(name="Idle", value=status["checked_in"])
+        embed.add_field(name="Overflow", value=status["overflow"])
+        embed.add_field(name="Checkouts", value=f'{status["checkouts"]:,}')
+        embed.add_field(name="Statement cache hit rate", value="N/A" if hit_rate is None else f"{hit_rate:.1%}")
+        embed.add_field(
+            name="Connection wait time",
+            value=f'Average {status["average_wait"] * 1000:.2f}ms, maximum {status["max_wait"] * 1000:.2f}ms',
+            inline=False
+        )
+        embed.add_field(
+            name="Wait time histogram",
+            value="```" + "\n".join(f"{label:>8} {count:,}" for label, count in status["wait_histogram"]) + "```",
+            inline=False
+        )
+        await ctx.reply(embed=embed)
+
+    @commands.command( # type: ignore
+        name="cache-stats",
+        brief="Displays TheoTown API response cache statistics.",
+        aliases=["cachestats"],
+        category=OwnerCategory
+    )
+    @commands.is_owner() # type: ignore
+    @commands.bot_has_permissions(send_messages=True) # type: ignore
+    async def cachestats(self, ctx: Context):
+        status = self.client.api.get_response_cache_status()
+        hit_rate = status["hit_rate"]
+
+        embed = PidroidEmbed(title="TheoTown API response cache statistics")
+        embed.add_field(name="Cached responses", value=f'{status["size"]:,}/{status["max_size"]:,}')
+        embed.add_field(name="Hit rate", value="N/A" if hit_rate is None else f"{hit_rate:.1%}")
+        embed.add_field(name="Fresh hits", value=f'{status["hits"]:,}')
+        embed.add_field(name="Stale hits", value=f'{status["stale_hits"]:,}')
+        embed.add_field(name="Misses", value=f'{status["misses"]:,}')
+        await ctx.reply(embed=embed)
+
+    @commands.command( # type: ignore
+        name="http-stats",
+        brief="Displays outbound HTTP request statistics for every host.",
+        aliases=["httpstats"],
+        category=OwnerCategory
+    )
+    @commands.is_owner() # type: ignore
+    @commands.bot_has_permissions(send_messages=True) # type: ignore
+    async def httpstats(self, ctx: Context):
+        hosts = sorted(self.client.outbound_statistics.hosts.items(), key=lambda h: h[1].requests, reverse=True)
+
+        embed = PidroidEmbed(title="Outbound HTTP request statistics")
+        embed.add_field(name="TheoTown API circuit breaker", value=self.client.api.get_circuit_breaker_state().capitalize(), inline=False)
+        # Embeds are limited to 25 fields
+        for host, statistics in hosts[:24]:
+            embed.add_field(
+                name=host,
+                value=(
+                    f"{statistics.requests:,} requests, {statistics.error_rate:.1%} errors\n"
+                    f"Average {statistics.average_latency * 1000:.0f}ms, maximum {statistics.max_latency * 1000:.0f}ms"
+                ),
+                inline=False
+            )
+        await ctx.reply(embed=embed)
+
 async def setup(client: Pidroid) -> None:
     await client.add_cog(OwnerCommands(client))
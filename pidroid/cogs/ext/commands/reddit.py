@@ -75,14 +75,11 @@ class RedditCommands(commands.Cog): # type: ignore
             client_secret=c['reddit_client_secret'],
             username=c['reddit_username'],
             password=c['reddit_password'],
-            user_agent="Pidroid bot by u/RealJustAnyone"
+            user_agent="Pidroid bot by u/RealJustAnyone",
+            # The shared client session is closed by the client itself, so the instance is not closed on unload
+            requestor_kwargs={"session": self.client.session}
         )
 
-    def cog_unload(self) -> None:
-        # Logout from reddit session
-        if self.reddit_instance is not None:
-            self.client.loop.create_task(self.reddit_instance.close())  # Just so I don't get asyncio unclosed loop errors
-
     @commands.command( # type: ignore
         brief='Fetches a random post from specified subreddit.',
         usage='<subreddit name>',
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import copy
 import datetime
 
 from discord.ext import commands # type: ignore
@@ -12,13 +14,15 @@ from discord.member import Member
 from discord.mentions import AllowedMentions
 from discord.message import Message
 from discord.utils import escape_markdown, format_dt
+from collections import OrderedDict
 from io import BytesIO
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
 
 from pidroid.cogs.models.categories import TagCategory
 from pidroid.cogs.utils.checks import has_moderator_permissions
 from pidroid.cogs.utils.decorators import command_checks
 from pidroid.cogs.utils.embeds import PidroidEmbed, SuccessEmbed
+from pidroid.cogs.utils.time import utcnow
 
 FORBIDDEN_CHARS = "!@#$%^&*()-+?_=,<>/"
 RESERVED_WORDS = [
@@ -28,6 +32,9 @@ RESERVED_WORDS = [
 ]
 ALLOWED_MENTIONS = AllowedMentions(everyone=False, users=False, roles=False, replied_user=False)
 
+# Maximum amount of guilds whose tags are kept in memory at once
+TAG_CACHE_MAX_GUILDS = 64
+
 if TYPE_CHECKING:
     from pidroid.client import Pidroid
     from pidroid.cogs.utils.api import API, TagTable
@@ -49,6 +56,8 @@ class Tag:
     def __init__(self, api: API, data: TagTable = None) -> None:
         self.api = api
         self._author_ids = []
+        self.aliases = []
+        self.locked = False
         if data:
             self._deserialize(data)
 
@@ -120,19 +129,150 @@ class Tag:
         self.locked = data.locked # type: ignore
         self.date_created = data.date_created # type: ignore
 
+    def copy(self) -> Tag:
+        """Returns a copy of the tag which can be modified independently."""
+        tag = copy.copy(self)
+        tag._author_ids = list(self._author_ids)
+        tag.aliases = list(self.aliases)
+        return tag
+
     async def create(self) -> None:
         """Creates a tag by inserting a document to the database."""
-        self._id = await self.api.insert_tag(self.guild_id, self.name, self.content, self._author_ids)
+        self.date_created = utcnow()
+        self._id = await self.api.insert_tag(self.guild_id, self.name, self.content, self._author_ids, self.date_created)
+        self.api.tag_cache.store(self)
 
     async def edit(self) -> None:
         """Edits a tag by updating the document in the database."""
         await self.api.update_tag(self._id, self.content, self._author_ids, self.aliases, self.locked)
+        self.api.tag_cache.store(self)
 
     async def remove(self) -> None:
         """Removes a tag from the database."""
         if not self.api:
             raise BadArgument("API attribute is missing!")
         await self.api.delete_tag(self._id)
+        self.api.tag_cache.discard(self)
+
+
+class GuildTags:
+    """This class represents the tags of a single guild, indexed by lowercased name and alias."""
+
+    def __init__(self, tags: List[Tag]) -> None:
+        self._tags: Dict[int, Tag] = {}
+        self._index: Dict[str, Tag] = {}
+        for tag in tags:
+            self._tags[tag._id] = tag
+        self._build_index()
+
+    def _build_index(self) -> None:
+        self._index.clear()
+        # Aliases are indexed first, so that a tag name always takes priority over an alias
+        for tag in self._tags.values():
+            for alias in tag.aliases:
+                self._index[alias.lower()] = tag
+        for tag in self._tags.values():
+            self._index[tag.name.lower()] = tag
+
+    def get(self, name: str) -> Optional[Tag]:
+        """Returns a tag by its name or alias."""
+        return self._index.get(name.lower())
+
+    def search(self, query: str) -> List[Tag]:
+        """Returns all tags whose names contain the query.
+
+        Exact matches come first, followed by names starting with the query and then the rest by name."""
+        query = query.lower()
+        return sorted(
+            [t for t in self._tags.values() if query in t.name.lower()],
+            key=lambda t: (t.name.lower() != query, not t.name.lower().startswith(query), t.name)
+        )
+
+    def all(self) -> List[Tag]:
+        """Returns all tags ordered by name."""
+        return sorted(self._tags.values(), key=lambda t: t.name)
+
+    def names(self) -> List[str]:
+        """Returns names of all tags in alphabetical order."""
+        return sorted(t.name for t in self._tags.values())
+
+    def store(self, tag: Tag) -> None:
+        self._tags[tag._id] = tag
+        self._build_index()
+
+    def discard(self, tag_id: int) -> None:
+        if self._tags.pop(tag_id, None) is not None:
+            self._build_index()
+
+
+class TagCache:
+    """This class implements a write-through cache of guild tags.
+
+    Tags of a guild are loaded on first access and the least recently used guilds
+    are evicted once more than TAG_CACHE_MAX_GUILDS guilds are cached.
+    Guilds whose tags were changed by other processes are invalidated through database notifications."""
+
+    def __init__(self, api: API, max_guilds: int = TAG_CACHE_MAX_GUILDS) -> None:
+        self.api = api
+        self.max_guilds = max_guilds
+        self._guilds: OrderedDict[int, GuildTags] = OrderedDict()
+        self._loading: Dict[int, asyncio.Task] = {}
+        # Guilds which were written to while their tags were being loaded
+        self._stale: Set[int] = set()
+
+    async def get_guild(self, guild_id: int) -> GuildTags:
+        """Returns cached tags of the guild, loading them from the database if necessary."""
+        guild_tags = self._guilds.get(guild_id)
+        if guild_tags is not None:
+            self._guilds.move_to_end(guild_id)
+            return guild_tags
+
+        task = self._loading.get(guild_id)
+        if task is None:
+            self._stale.discard(guild_id)
+            task = asyncio.create_task(self._load(guild_id))
+            self._loading[guild_id] = task
+        return await task
+
+    async def _load(self, guild_id: int) -> GuildTags:
+        try:
+            guild_tags = GuildTags(await self.api._fetch_guild_tags(guild_id))
+        finally:
+            del self._loading[guild_id]
+
+        # Only keep the result if it could not have missed a concurrent write
+        if guild_id not in self._stale:
+            self._guilds[guild_id] = guild_tags
+            while len(self._guilds) > self.max_guilds:
+                self._guilds.popitem(last=False)
+        return guild_tags
+
+    def store(self, tag: Tag) -> None:
+        """Stores a copy of a created or modified tag, if the guild is cached."""
+        guild_tags = self._guilds.get(tag.guild_id)
+        if guild_tags is not None:
+            guild_tags.store(tag.copy())
+        elif tag.guild_id in self._loading:
+            self._stale.add(tag.guild_id)
+
+    def discard(self, tag: Tag) -> None:
+        """Removes a deleted tag, if the guild is cached."""
+        guild_tags = self._guilds.get(tag.guild_id)
+        if guild_tags is not None:
+            guild_tags.discard(tag._id)
+        elif tag.guild_id in self._loading:
+            self._stale.add(tag.guild_id)
+
+    def invalidate(self, guild_id: int) -> None:
+        """Removes the cached tags of the guild, so that they are loaded again on next access."""
+        self._guilds.pop(guild_id, None)
+        if guild_id in self._loading:
+            self._stale.add(guild_id)
+
+    def clear(self) -> None:
+        """Removes the cached tags of every guild."""
+        self._guilds.clear()
+        self._stale.update(self._loading)
 
 
 class TagCommands(commands.Cog): # type: ignore
@@ -156,6 +296,10 @@ class TagCommands(commands.Cog): # type: ignore
 
         tag_list = await self.client.api.search_guild_tags(ctx.guild.id, tag_name)
         if len(tag_list) == 0:
+            suggestions = await self.client.api.suggest_guild_tags(ctx.guild.id, tag_name)
+            if len(suggestions) > 0:
+                suggestion_str = '``, ``'.join(suggestions)
+                raise BadArgument(f"I couldn't find any tags matching that name! Did you mean ``{suggestion_str}``?")
             raise BadArgument("I couldn't find any tags matching that name!")
         return tag_list
 
@@ -216,13 +360,13 @@ class TagCommands(commands.Cog): # type: ignore
     @commands.guild_only() # type: ignore
     async def list(self, ctx: Context):
         assert ctx.guild is not None
-        guild_tags = await self.client.api.fetch_guild_tags(ctx.guild.id)
-        if len(guild_tags) == 0:
+        tag_names = await self.client.api.fetch_guild_tag_names(ctx.guild.id)
+        if len(tag_names) == 0:
             raise BadArgument("This server has no defined tags!")
 
         embed = PidroidEmbed()
         embed.title = f"{escape_markdown(ctx.guild.name)} server tags"
-        embed.description = f'({len(guild_tags)}) **' + '**, **'.join([t.name for t in guild_tags]) + '**'
+        embed.description = f'({len(tag_names)}) **' + '**, **'.join(tag_names) + '**'
         await ctx.reply(embed=embed)
 
     @tag.command(
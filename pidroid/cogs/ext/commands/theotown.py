@@ -136,7 +136,8 @@ class TheoTownCommands(commands.Cog): # type: ignore
                 self.gallery.reset_cooldown(ctx)
                 return await ctx.reply(embed=ErrorEmbed('Number must be between 1 and 200!'))
 
-            res = await self.client.api.get(Route("/public/game/gallery", {"mode": selected_mode, "limit": number}))
+            # The whole gallery page is requested, so that every position shares one cached response
+            res = await self.client.api.get(Route("/public/game/gallery", {"mode": selected_mode, "limit": 200}))
             if not res["success"]:
                 return await ctx.reply(embed=ErrorEmbed("Unable to retrieve gallery data!"))
 
@@ -187,9 +188,9 @@ class TheoTownCommands(commands.Cog): # type: ignore
             async with ctx.channel.typing():
                 if is_id:
                     assert pl_id is not None
-                    plugin_list = await self.api.fetch_plugin_by_id(pl_id)
+                    plugin_list = await self.api.find_plugin_by_id(pl_id)
                 else:
-                    plugin_list = await self.api.search_plugins(query)
+                    plugin_list = await self.api.find_plugins(query)
 
             plugin_count = len(plugin_list)
             if plugin_count == 0:
@@ -1,7 +1,6 @@
 import asyncio
 import datetime
 
-from discord import File
 from discord.message import Message
 from discord.ext import commands # type: ignore
 from random import randint
@@ -9,7 +8,6 @@ from random import randint
 from pidroid.client import Pidroid
 from pidroid.constants import JUSTANYONE_ID
 from pidroid.cogs.utils.checks import is_client_development, is_guild_theotown
-from pidroid.cogs.utils.file import Resource
 from pidroid.cogs.utils.time import utcnow
 
 def find_whole_word(word: str, string: str) -> bool:
@@ -68,6 +66,9 @@ class CopypastaEventHandler(commands.Cog): # type: ignore
             "among_us": empty_date
         }
 
+    async def cog_load(self):
+        await self.client.resource_cache.preload('ja ping.png')
+
     def check_probability(self, x: int) -> bool:
         """Returns true if random integer produced by 1 and x is 1.
 
@@ -114,7 +115,7 @@ class CopypastaEventHandler(commands.Cog): # type: ignore
         if message.author.id != JUSTANYONE_ID:
             if len(message.mentions) > 0 and any(mention.id == JUSTANYONE_ID for mention in message.mentions):
                 if self.check_cooldown("ping_ja", 60 * 60 * 24):
-                    await message.reply(file=File(Resource('ja ping.png')), delete_after=0.9)
+                    await self.client.resource_cache.send(message.reply, 'ja ping.png', delete_after=0.9)
 
         # Linux copypasta
         if self.is_linux(content):
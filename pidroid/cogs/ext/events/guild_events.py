@@ -13,19 +13,14 @@ class GuildEventHandler(commands.Cog): # type: ignore
 
     @commands.Cog.listener() # type: ignore
     async def on_guild_join(self, guild: Guild):
-        await self.client.wait_guild_config_cache_ready()
-
-        if self.client.get_guild_configuration(guild.id):
-            return
-
-        config = await self.client.api.insert_guild_configuration(guild.id)
-        self.client._update_guild_configuration(guild.id, config)
+        # Loads the configuration, creating it if the guild does not have one
+        await self.client.fetch_guild_configuration(guild.id)
 
     @commands.Cog.listener() # type: ignore
     async def on_guild_remove(self, guild: Guild):
-        await self.client.wait_guild_config_cache_ready()
+        await self.client.wait_until_ready()
 
-        config = self.client.get_guild_configuration(guild.id)
+        config = self.client.guild_configurations.get(guild.id) or await self.client.api.fetch_guild_configuration(guild.id)
         if config is None:
             return
 
@@ -35,13 +30,7 @@ class GuildEventHandler(commands.Cog): # type: ignore
     @commands.Cog.listener() # type: ignore
     async def on_guild_role_delete(self, role: Role) -> None:
         """Handles configuration updates based on role removals."""
-        await self.client.wait_guild_config_cache_ready()
-
-        guild_id = role.guild.id
-        config = self.client.get_guild_configuration(guild_id)
-        if config is None:
-            return
-
+        config = await self.client.fetch_guild_configuration(role.guild.id)
         if config.jail_role == role.id:
             await config.update_jail_role(None)
         elif config.mute_role == role.id:
@@ -55,15 +44,7 @@ class GuildEventHandler(commands.Cog): # type: ignore
         if not isinstance(guild_channel, TextChannel):
             return
 
-        await self.client.wait_guild_config_cache_ready()
-
-        guild_id = guild_channel.guild.id
-        if self.client.get_guild_configuration(guild_id):
-            return
-
-        config = self.client.get_guild_configuration(guild_id)
-        if config is None:
-            return
+        config = await self.client.fetch_guild_configuration(guild_channel.guild.id)
         if config.jail_channel == guild_channel.id:
             await config.update_jail_channel(None)
 
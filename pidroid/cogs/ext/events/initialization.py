@@ -15,6 +15,8 @@ class InvocationEventHandler(commands.Cog): # type: ignore
     def __init__(self, client: Pidroid) -> None:
         self.client = client
         self.log = self.client.logger
+        self.client.api.add_listener("on_guild_configuration_changed", self.on_guild_configuration_changed)
+        self.client.api.add_listener("on_guild_configurations_stale", self.on_guild_configurations_stale)
 
     @commands.Cog.listener() # type: ignore
     async def on_ready(self) -> None:
@@ -27,22 +29,47 @@ class InvocationEventHandler(commands.Cog): # type: ignore
 
     def cog_unload(self):
         """Ensure that tasks are cancelled on cog unload."""
+        self.client.api.remove_listener("on_guild_configuration_changed", self.on_guild_configuration_changed)
+        self.client.api.remove_listener("on_guild_configurations_stale", self.on_guild_configurations_stale)
         self.annoy_erk.cancel()
 
+    async def on_guild_configuration_changed(self, guild_id: int) -> None:
+        """Re-reads the guild configuration after it was changed by this or any other process."""
+        config = await self.client.api.fetch_guild_configuration(guild_id)
+        if config is None:
+            self.client._remove_guild_configuration(guild_id)
+        else:
+            self.client._update_guild_configuration(guild_id, config)
+
+    async def on_guild_configurations_stale(self) -> None:
+        """Reloads all guild configurations as changes could have been missed."""
+        await self._fill_guild_config_cache()
+
     async def _fill_guild_config_cache(self):
         self.log.debug("Filling guild configuration cache")
         raw_configs = await self.client.api.fetch_guild_configurations()
         for config in raw_configs:
             self.client._update_guild_configuration(config.guild_id, config)
+
+        # Configurations which were deleted while changes could have been missed
+        fetched_guild_ids = {c.guild_id for c in raw_configs}
+        for guild_id in [g for g in self.client.guild_configurations if g not in fetched_guild_ids]:
+            self.client._remove_guild_configuration(guild_id)
         self.log.debug("Cache filled")
 
         # Generate configurations for guilds that do not already have it
-        for guild in self.client.guilds:
-            config = self.client.get_guild_configuration(guild.id)
-            if config is None:
-                config = await self.client.api.insert_guild_configuration(guild.id)
-                self.client._update_guild_configuration(guild.id, config)
-                self.log.warn(f"Guild \"{guild.name}\" ({guild.id}) did not have a guild configuration. Generated one automatically")
+        missing_guild_ids = [g.id for g in self.client.guilds if g.id not in self.client.guild_configurations]
+        for config in await self.client.api.insert_guild_configurations(missing_guild_ids):
+            self.client._update_guild_configuration(config.guild_id, config)
+            guild = self.client.get_guild(config.guild_id)
+            self.log.warn(f"Guild \"{guild}\" ({config.guild_id}) did not have a guild configuration. Generated one automatically")
+
+        # Configurations which were created by another process in the meantime
+        for guild_id in missing_guild_ids:
+            if guild_id not in self.client.guild_configurations:
+                config = await self.client.api.fetch_guild_configuration(guild_id)
+                if config is not None:
+                    self.client._update_guild_configuration(guild_id, config)
 
         self.client._guild_config_ready.set()
         self.log.debug("Guild configuration cache filled")
@@ -1,14 +1,17 @@
+from __future__ import annotations
+
 import asyncio
 import base64
 import emoji # type: ignore # I am not updating the emoji regex myself every time there's a new one
 import re
 
+from collections import OrderedDict
 from contextlib import suppress
 from discord.ext import commands # type: ignore
 from discord.channel import TextChannel
 from discord.utils import remove_markdown
 from discord.message import Message
-from typing import List, Optional, Tuple
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
 from pidroid.client import Pidroid
 from pidroid.cogs.utils.aliases import GuildChannel
@@ -54,6 +57,18 @@ CUSTOM_EMOJI_PATTERN = re.compile(r'<(a:.+?:\d+|:.+?:\d+)>')
 URL_PATTERN = re.compile(r'(https?:\/\/)(\s)*(www\.)?(\s)*((\w|\s)+\.)*([\w\-\s]+\/)*([\w\-]+)((\?)?[\w\s]*=\s*[\w\%&]*)*')
 BASE64_PATTERN = re.compile(r'^([A-Za-z0-9+/]{4})*([A-Za-z0-9+/]{3}=|[A-Za-z0-9+/]{2}==)?$')
 
+# Maximum amount of strings whose translations are kept in memory
+TRANSLATION_CACHE_SIZE = 2048
+
+# How long to collect texts for a single DeepL request, in seconds
+TRANSLATION_BATCH_WINDOW = 0.5
+# Maximum amount of texts in a single DeepL request, DeepL accepts up to 50
+TRANSLATION_BATCH_SIZE = 25
+# Maximum amount of DeepL requests in flight at once
+MAX_CONCURRENT_TRANSLATION_REQUESTS = 3
+
+BatchTranslator = Callable[[List[Tuple[str, str]]], Awaitable[List[List[dict]]]]
+
 def remove_emojis(string: str) -> str:
     """Removes all emojis from a string."""
     stripped = re.sub(CUSTOM_EMOJI_PATTERN, "", string)
@@ -114,6 +129,108 @@ class TextParser:
         # Otherwise, just return normal string
         return ParserFlags.NORMAL, self.text
 
+class TranslationCache:
+    """This class implements an in-memory LRU cache of stored translations.
+
+    Strings which are known to have no stored translation are cached as empty lists,
+    so that they can be sent for translation without querying the database first."""
+
+    def __init__(self, max_size: int = TRANSLATION_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[str, List[dict]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[List[dict]]:
+        """Returns cached translations for the key or None, if the key is not cached."""
+        translations = self._entries.get(key)
+        if translations is not None:
+            self._entries.move_to_end(key)
+        return translations
+
+    def put(self, key: str, translations: List[dict]) -> None:
+        self._entries[key] = translations
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+class TranslationQueue:
+    """This class implements a queue which collects texts over a short window and translates them in batches.
+
+    Texts are identified by their cache key, so that the same text submitted multiple times
+    while it is still pending is only translated once."""
+
+    def __init__(
+        self,
+        translate_batch: BatchTranslator,
+        window: float = TRANSLATION_BATCH_WINDOW,
+        batch_size: int = TRANSLATION_BATCH_SIZE,
+        max_concurrency: int = MAX_CONCURRENT_TRANSLATION_REQUESTS
+    ) -> None:
+        self._translate_batch = translate_batch
+        self.window = window
+        self.batch_size = batch_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self._pending: Dict[str, Tuple[str, asyncio.Future]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def translate(self, key: str, text: str) -> List[dict]:
+        """Queues the text for translation and returns its translations once the batch is processed."""
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending[1])
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = (text, future)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.window, self.flush)
+        return await asyncio.shield(future)
+
+    def flush(self) -> None:
+        """Sends all pending texts for translation."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if len(self._pending) == 0:
+            return
+
+        batch = self._pending
+        self._pending = {}
+        task = asyncio.create_task(self._process(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, batch: Dict[str, Tuple[str, asyncio.Future]]) -> None:
+        items = [(key, text) for key, (text, _) in batch.items()]
+        try:
+            async with self._semaphore:
+                results = await self._translate_batch(items)
+            for (_, future), translations in zip(batch.values(), results):
+                if not future.done():
+                    future.set_result(translations)
+        except Exception as e:
+            for _, future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            # Make sure nobody waits forever if the batch was cancelled
+            for _, future in batch.values():
+                future.cancel()
+
+    def close(self) -> None:
+        """Cancels pending and in-flight translations."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for _, future in self._pending.values():
+            future.cancel()
+        self._pending = {}
+        for task in self._tasks:
+            task.cancel()
+
 class TranslationEventHandler(commands.Cog): # type: ignore
     """This class implements a cog for event handling related to TheoTown translations."""
 
@@ -122,31 +239,52 @@ class TranslationEventHandler(commands.Cog): # type: ignore
         self.endpoint = "https://api.deepl.com/v2"
         self.auth_key = self.client.config.get("deepl_api_key", None)
 
-        self._translating = asyncio.Event()
-        self._translating.set()
+        self.queue = TranslationQueue(self.translate_batch)
 
         self.daily_char_limit = 50000
         self.used_chars = 0
         self.last_reset = utcnow()
 
         self.channel: Optional[TextChannel] = None
+        self.cache = TranslationCache()
+
+    def cog_unload(self):
+        """Ensure that pending translations are cancelled on cog unload."""
+        self.queue.close()
 
-    async def translate(self, text: str) -> List[dict]:
-        self._translating.clear()
+    async def translate(self, texts: List[str]) -> List[dict]:
+        """Translates multiple texts in a single request, returning a translation for each text in order."""
         try:
-            async with await post(self.client, self.endpoint + "/translate", {
-                "auth_key": self.auth_key,
-                "text": text,
-                "target_lang": "EN"
-            }) as r:
+            async with await post(
+                self.client, self.endpoint + "/translate",
+                [("auth_key", self.auth_key), ("target_lang", "EN")] + [("text", text) for text in texts]
+            ) as r:
                 data = await r.json()
         except Exception as e:
-            self.client.logger.critical("Failure while translating:", e)
-            self._translating.set()
+            self.client.logger.critical(f"Failure while translating: {e}")
             return []
-        self._translating.set()
         return data["translations"]
 
+    async def translate_batch(self, items: List[Tuple[str, str]]) -> List[List[dict]]:
+        """Translates a batch of texts and stores the translations.
+
+        Returns a list of translations for each of the cache key and text pairs."""
+        translations = await self.translate([text for _, text in items])
+        if len(translations) != len(items):
+            return [[] for _ in items]
+
+        try:
+            await self.client.api.insert_translation_entries([
+                (key, t["detected_source_language"], t["text"]) for (key, _), t in zip(items, translations)
+            ])
+        except Exception as e:
+            self.client.logger.exception(f"Failure while storing translations: {e}")
+
+        results = [[t] for t in translations]
+        for (key, _), result in zip(items, results):
+            self.cache.put(key, result)
+        return results
+
     async def get_usage(self) -> dict:
         async with await post(self.client, self.endpoint + "/usage", {
             "auth_key": self.auth_key
@@ -164,22 +302,21 @@ class TranslationEventHandler(commands.Cog): # type: ignore
         )
 
     async def translate_message(self, message: Message, clean_text: str) -> List[dict]:
-        # Await previous translation jobs to finish
-        await self._translating.wait()
-
-        # Check if daily limit is not reached, if it is, stop translating
-        if len(clean_text) + self.used_chars > self.daily_char_limit:
-            self.client.logger.critical("Failure translating encountered, the daily character limit was exceeded")
-            return []
-        self.used_chars += len(clean_text)
-
         # Check if text was already translated
         c_key = clean_text.lower()
-        translations = await self.client.api.fetch_translations(c_key)
+        translations = self.cache.get(c_key)
+        if translations is None:
+            translations = await self.client.api.fetch_translations(c_key)
+            self.cache.put(c_key, translations)
+
         if len(translations) == 0:
-            translations = await self.translate(clean_text)
-            for t in translations:
-                await self.client.api.insert_translation_entry(c_key, t["detected_source_language"], t["text"])
+            # Check if daily limit is not reached, if it is, stop translating
+            if len(clean_text) + self.used_chars > self.daily_char_limit:
+                self.client.logger.critical("Failure translating encountered, the daily character limit was exceeded")
+                return []
+            self.used_chars += len(clean_text)
+
+            translations = await self.queue.translate(c_key, clean_text)
 
         # If message could not be translated, log it as a warning
         if len(translations) == 0:
@@ -25,11 +25,7 @@ class AutomodTask(commands.Cog): # type: ignore
         if member.bot:
             return
 
-        await self.client.wait_guild_config_cache_ready()
-        config = self.client.get_guild_configuration(member.guild.id)
-        if config is None:
-            return
-
+        config = await self.client.fetch_guild_configuration(member.guild.id)
         await self.handle_suspicious_member(config, member)
 
 async def setup(client: Pidroid) -> None:
@@ -60,8 +60,7 @@ async def monthly_plugin_cronjob(client: Pidroid) -> None:
         previous_month = client.persistent_data.data.get("last plugin info month", None)
 
         if month_of_data != previous_month:
-            client.persistent_data.data.update({"last plugin info month": month_of_data})
-            client.persistent_data.save()
+            client.persistent_data.update({"last plugin info month": month_of_data})
 
             top_creators_last = data['plugin creators last month']
             plugins_all_time = data['plugins all time']
@@ -4,6 +4,7 @@ from discord.utils import format_dt
 
 from pidroid.client import Pidroid
 from pidroid.constants import THEOTOWN_FORUM_URL
+from pidroid.cogs.models.exceptions import APIUnavailable
 from pidroid.cogs.utils.checks import is_client_pidroid
 from pidroid.cogs.utils.embeds import PidroidEmbed
 from pidroid.cogs.utils.http import Route
@@ -45,6 +46,8 @@ class ForumMessageTask(commands.Cog): # type: ignore
                 embed.set_author(name=author_name, icon_url=author_avatar_url, url=author_url)
                 embed.set_footer(text=f"Message ID: {message_id}")
                 await channel.send(embed=embed)
+        except APIUnavailable:
+            self.client.logger.warning("TheoTown API is unavailable, unable to fetch Pidroid messages")
         except Exception:
             self.client.logger.exception("An exception was encountered while trying to fetch Pidroid messages")
 
@@ -1,14 +1,33 @@
+from __future__ import annotations
+
+import asyncio
+import discord
+
 from aiohttp.client_exceptions import ServerDisconnectedError
+from collections import OrderedDict
 from datetime import timedelta
 from discord.channel import TextChannel
 from discord.ext import tasks, commands # type: ignore
-from typing import List
+from discord.message import Message
+from typing import Optional, Set
 
 from pidroid.client import Pidroid
+from pidroid.cogs.models.exceptions import APIUnavailable
+from pidroid.cogs.models.plugins import NewPlugin
 from pidroid.cogs.utils.checks import is_client_pidroid
 from pidroid.cogs.utils.parsers import truncate_string
 from pidroid.cogs.utils.time import timedelta_to_datetime
 
+# Channel where newly approved plugins are showcased
+SHOWCASE_CHANNEL_ID = 640522649033769000
+
+# Maximum amount of published plugin revisions remembered, so that they are not published twice
+PUBLISHED_REVISIONS_LIMIT = 500
+
+# Maximum amount of showcase messages which get their reactions and threads at the same time,
+# discord.py waits out rate limits by itself, this only keeps bursts from queueing up too many requests
+MAX_CONCURRENT_FOLLOW_UPS = 3
+
 class PluginStoreTasks(commands.Cog): # type: ignore
     """This class implements a cog for handling of automatic tasks related to TheoTown's plugin store."""
 
@@ -18,7 +37,10 @@ class PluginStoreTasks(commands.Cog): # type: ignore
         self.use_threads = True
         self.add_reactions = True
 
-        self.new_plugins_cache: List[int] = []
+        self._channel: Optional[TextChannel] = None
+        self._published_revisions: Optional[OrderedDict[int, None]] = None
+        self._follow_ups: Set[asyncio.Task] = set()
+        self._follow_up_semaphore = asyncio.Semaphore(MAX_CONCURRENT_FOLLOW_UPS)
 
         self.retrieve_new_plugins.start()
 
@@ -26,55 +48,102 @@ class PluginStoreTasks(commands.Cog): # type: ignore
         """Ensure that tasks are cancelled on cog unload."""
         self.retrieve_new_plugins.cancel()
 
+    @property
+    def published_revisions(self) -> OrderedDict[int, None]:
+        """Returns an ordered set of recently published plugin revision IDs."""
+        if self._published_revisions is None:
+            revisions = self.client.persistent_data.data.get("published plugin revisions", [])
+            self._published_revisions = OrderedDict.fromkeys(revisions)
+        return self._published_revisions
+
+    async def get_showcase_channel(self) -> Optional[TextChannel]:
+        """Returns the plugin showcase channel, resolving it only once."""
+        if self._channel is None:
+            channel = await self.client.get_or_fetch_channel(SHOWCASE_CHANNEL_ID)
+            if isinstance(channel, TextChannel):
+                self._channel = channel
+        return self._channel
+
     @tasks.loop(seconds=30)
     async def retrieve_new_plugins(self) -> None:
         """Retrieves new plugin store plugins and publishes them to TheoTown guild channel."""
-        
-        await self.client.fetch_channel(640522649033769000)
-        
-        channel = await self.client.get_or_fetch_channel(640522649033769000)
-        if channel is None:
-            return self.client.logger.warning("Showcase channel returned a None!")
-        assert isinstance(channel, TextChannel)
-
         try:
             last_approval_time = self.client.persistent_data.data.get("last plugin approval", -1)
 
             plugins = await self.client.api.fetch_new_plugins(last_approval_time)
-
-            if len(plugins) == 0:
-                self.new_plugins_cache = []
+            self.client.api.plugin_index.update(plugins)
+            self.client.api.refresh_plugin_index()
+
+            # Oldest plugins are published first, so that the approval time only ever moves forward
+            pending = sorted(
+                [p for p in plugins if p.revision_id not in self.published_revisions],
+                key=lambda p: p.time
+            )
+            if len(pending) == 0:
                 return
 
-            latest_approval_time = plugins[0].time
+            channel = await self.get_showcase_channel()
+            if channel is None:
+                return self.client.logger.warning("Showcase channel could not be resolved!")
 
-            if latest_approval_time > last_approval_time:
-
-                self.client.persistent_data.data.update({"last plugin approval": latest_approval_time})
-                self.client.persistent_data.save()
-
-                for plugin in plugins:
-
-                    if plugin.id in self.new_plugins_cache:
-                        continue
-                    self.new_plugins_cache.append(plugin.id)
-
-                    message = await channel.send(embed=plugin.to_embed())
-
-                    if self.add_reactions:
-                        await message.add_reaction("👍")
-                        await message.add_reaction("👎")
-
-                    if self.use_threads:
-                        await self.client.create_expiring_thread(
-                            message, f"{truncate_string(plugin.clean_title, 89)} discussion",
-                            timedelta_to_datetime(timedelta(days=7))
-                        )
+            for plugin in pending:
+                if plugin.revision_id not in self.published_revisions:
+                    await self.publish_plugin(channel, plugin)
         except ServerDisconnectedError:
             self.client.logger.exception("An server disconnection was encountered while trying to retrieve and publish new plugin information")
+        except APIUnavailable:
+            self.client.logger.warning("TheoTown API is unavailable, unable to retrieve new plugin information")
         except Exception:
             self.client.logger.exception("An exception was encountered while trying to retrieve and publish new plugin information")
 
+    async def publish_plugin(self, channel: TextChannel, plugin: NewPlugin) -> None:
+        """Sends the plugin showcase message and adds its reactions and thread in the background."""
+        try:
+            message = await channel.send(embed=plugin.to_embed())
+        except discord.NotFound:
+            # The channel is resolved again on the next run
+            self._channel = None
+            raise
+
+        # Recorded right after sending, so that the plugin is not published again after a restart
+        self.mark_published(plugin)
+
+        task = self.client.loop.create_task(self._follow_up(message, plugin))
+        self._follow_ups.add(task)
+        task.add_done_callback(self._follow_ups.discard)
+
+    def mark_published(self, plugin: NewPlugin) -> None:
+        """Records the plugin revision as published and moves the approval time forward."""
+        revisions = self.published_revisions
+        revisions[plugin.revision_id] = None
+        while len(revisions) > PUBLISHED_REVISIONS_LIMIT:
+            revisions.popitem(last=False)
+
+        persistent_data = self.client.persistent_data
+        persistent_data.update({
+            "last plugin approval": max(persistent_data.data.get("last plugin approval", -1), plugin.time),
+            "published plugin revisions": list(revisions)
+        })
+
+    async def _follow_up(self, message: Message, plugin: NewPlugin) -> None:
+        async with self._follow_up_semaphore:
+            try:
+                await asyncio.gather(self._add_reactions(message), self._create_thread(message, plugin))
+            except discord.HTTPException:
+                self.client.logger.exception(f"An exception was encountered while trying to follow up the showcase of plugin #{plugin.id}")
+
+    async def _add_reactions(self, message: Message) -> None:
+        if self.add_reactions:
+            await message.add_reaction("👍")
+            await message.add_reaction("👎")
+
+    async def _create_thread(self, message: Message, plugin: NewPlugin) -> None:
+        if self.use_threads:
+            await self.client.create_expiring_thread(
+                message, f"{truncate_string(plugin.clean_title, 89)} discussion",
+                timedelta_to_datetime(timedelta(days=7))
+            )
+
     @retrieve_new_plugins.before_loop
     async def before_new_plugin_retriever(self) -> None:
         """Runs before retrieve_new_plugins task to ensure that the task is allowed to run."""
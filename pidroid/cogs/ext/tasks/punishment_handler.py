@@ -1,58 +1,142 @@
+import asyncio
+import datetime
 import discord
+import heapq
 
 from contextlib import suppress
-from discord.ext import tasks, commands # type: ignore
-from typing import Union
+from discord.ext import commands # type: ignore
+from typing import List, Set, Tuple, Union
 
 from pidroid.client import Pidroid
+from pidroid.cogs.models.case import BaseCase, BasePunishment
 from pidroid.cogs.utils.getters import get_role
+from pidroid.cogs.utils.time import utcnow
+
+# Upper bound for a single sleep, so that long waits are periodically re-evaluated against the wall clock
+MAX_SCHEDULER_SLEEP = 60 * 60
+# Delays in seconds between attempts to load pending expirations, doubling after every failure
+LOAD_RETRY_BASE_DELAY = 5
+LOAD_RETRY_MAX_DELAY = 5 * 60
+# Time in seconds after which the expiration of a case in an unavailable guild is attempted again
+UNAVAILABLE_GUILD_RETRY_DELAY = 5 * 60
 
 class PunishmentHandlerTask(commands.Cog): # type: ignore
     """This class implements a cog for automatic punishment revocation and reassignment."""
 
     def __init__(self, client: Pidroid) -> None:
         self.client = client
-        self.check_punishments.start()
+
+        # Min-heap of (expiration date, case internal ID) pairs
+        self._expirations: List[Tuple[datetime.datetime, int]] = []
+        self._scheduled: Set[int] = set()
+        self._wakeup = asyncio.Event()
+
+        self.client.api.add_listener("on_ban_issued", self.on_punishment_issued)
+        self.client.api.add_listener("on_timeout_issued", self.on_punishment_issued)
+
+        self.expiry_scheduler = self.client.loop.create_task(self.run_expiry_scheduler())
 
     def cog_unload(self):
         """Ensure that tasks are cancelled on cog unload."""
-        self.check_punishments.stop()
-
-    @tasks.loop(seconds=5)
-    async def check_punishments(self) -> None:
-        """Periodically checks for expired punishments to remove."""
-        try:
-            for guild in self.client.guilds:
-                punishments = await self.client.api.fetch_active_expiring_guild_punishments(guild.id)
-                for punishment in punishments:
-
-                    # Immediately expire the punishment as far as DB is concerned
-                    await self.client.api.revoke_cases_by_type(punishment.type, guild.id, punishment.user_id)
-
-                    # If user is not able to be resolved, just skip everything
-                    if punishment.user is None:
-                        continue
-                    
-                    # Remove ban entry from Discord
-                    if punishment.type == "ban":
-                        with suppress(Exception):
-                            await guild.unban(punishment.user, reason=f"Ban expired | Case #{punishment.case_id}") # type: ignore
-
-        except Exception:
-            self.client.logger.exception("An exception was encountered while trying to check punishments")
-
-    @check_punishments.before_loop
-    async def before_check_punishments(self) -> None:
-        """Runs before check_punishment task to ensure that the task is allowed to run."""
-        await self.client.wait_guild_config_cache_ready()
+        self.client.api.remove_listener("on_ban_issued", self.on_punishment_issued)
+        self.client.api.remove_listener("on_timeout_issued", self.on_punishment_issued)
+        self.expiry_scheduler.cancel()
+
+    def schedule_expiration(self, case: BaseCase) -> None:
+        """Schedules the case to be expired at its expiration date."""
+        if case.date_expires is None or case._id in self._scheduled:
+            return
+
+        self._push(case.date_expires, case._id)
+
+    def _push(self, date: datetime.datetime, case_id: int) -> None:
+        self._scheduled.add(case_id)
+        heapq.heappush(self._expirations, (date, case_id))
+
+        # Wake the scheduler up if the new case expires before the one it's currently waiting for
+        if self._expirations[0][1] == case_id:
+            self._wakeup.set()
+
+    async def on_punishment_issued(self, punishment: BasePunishment) -> None:
+        """Schedules expiration for newly issued punishments."""
+        if punishment.case is not None:
+            self.schedule_expiration(punishment.case)
+
+    async def run_expiry_scheduler(self) -> None:
+        """Loads pending expirations once and then sleeps until the next one is due."""
+        await self.client.wait_until_ready()
+        await self.load_pending_expirations()
+
+        while True:
+            self._wakeup.clear()
+
+            if len(self._expirations) == 0:
+                await self._wakeup.wait()
+                continue
+
+            delay = (self._expirations[0][0] - utcnow()).total_seconds()
+            if delay > 0:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=min(delay, MAX_SCHEDULER_SLEEP))
+                continue
+
+            _, case_id = heapq.heappop(self._expirations)
+            self._scheduled.discard(case_id)
+            try:
+                await self.expire_punishment(case_id)
+            except Exception:
+                self.client.logger.exception("An exception was encountered while trying to expire a punishment")
+
+    async def load_pending_expirations(self) -> None:
+        """Schedules all pending expirations, retrying with backoff until they are loaded."""
+        delay = LOAD_RETRY_BASE_DELAY
+        while True:
+            try:
+                cases = await self.client.api.fetch_pending_expiring_punishments()
+            except Exception:
+                self.client.logger.exception(
+                    f"An exception was encountered while trying to load pending punishment expirations, retrying in {delay} seconds"
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, LOAD_RETRY_MAX_DELAY)
+                continue
+
+            for case in cases:
+                self.schedule_expiration(case)
+            return
+
+    async def expire_punishment(self, case_id: int) -> None:
+        """Revokes the punishment of the specified case, if it is still due."""
+        # Re-read the case as it could have been revoked or modified since it was scheduled
+        case = await self.client.api.fetch_case_by_internal_id(case_id)
+        if case is None or case.handled or case.date_expires is None:
+            return
+
+        if case.date_expires > utcnow():
+            return self.schedule_expiration(case)
+
+        guild = self.client.get_guild(case.guild_id)
+        if guild is None:
+            # The guild may be temporarily unavailable, the case is kept until it can be expired
+            self._push(utcnow() + datetime.timedelta(seconds=UNAVAILABLE_GUILD_RETRY_DELAY), case._id)
+            return
+
+        # Immediately expire the punishment as far as DB is concerned
+        await self.client.api.revoke_cases_by_type(case.type, guild.id, case.user_id)
+
+        # If user is not able to be resolved, just skip everything
+        if case.user is None:
+            return
+
+        # Remove ban entry from Discord
+        if case.type == "ban":
+            with suppress(Exception):
+                await guild.unban(case.user, reason=f"Ban expired | Case #{case.case_id}") # type: ignore
 
     @commands.Cog.listener() # type: ignore
     async def on_member_join(self, member: discord.Member) -> None:
         """Handles role-based punishment revocation for new members."""
-        await self.client.wait_guild_config_cache_ready()
-
-        c = self.client.get_guild_configuration(member.guild.id)
-        assert c is not None
+        c = await self.client.fetch_guild_configuration(member.guild.id)
 
         jail_role = get_role(member.guild, c.jail_role)
         if jail_role is not None:
@@ -68,15 +152,12 @@ class PunishmentHandlerTask(commands.Cog): # type: ignore
     @commands.Cog.listener() # type: ignore
     async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
         """Handles jail and mute role removal."""
-        await self.client.wait_guild_config_cache_ready()
-
         guild_id = before.guild.id
         changed_roles = list(set(before.roles) - set(after.roles)) or None
         if changed_roles is None:
             return
 
-        c = self.client.get_guild_configuration(guild_id)
-        assert c is not None
+        c = await self.client.fetch_guild_configuration(guild_id)
 
         if changed_roles[0].id == c.jail_role:
             if await self.client.api.is_currently_jailed(guild_id, after.id):
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import datetime
 import discord
 
@@ -15,15 +16,16 @@ from discord.role import Role
 from discord.user import User
 from discord.utils import format_dt
 from discord import AuditLogEntry
-from typing import TYPE_CHECKING, List, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
 from pidroid.cogs.utils.aliases import GuildTextChannel
 from pidroid.cogs.utils.embeds import PidroidEmbed, SuccessEmbed
 from pidroid.cogs.utils.file import Resource
-from pidroid.cogs.utils.paginators import ListPageSource, PidroidPages
+from pidroid.cogs.utils.paginators import PageSource, PidroidPages
 from pidroid.cogs.utils.time import delta_to_datetime, humanize, time_since, utcnow
 
 if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession # type: ignore
     from pidroid.cogs.utils.api import API, PunishmentTable
     DiscordUser = Union[Member, User]
     Moderator = Union[Member, User]
@@ -129,11 +131,18 @@ class Case(BaseCase):
 
     def __init__(self, api: API, data: PunishmentTable) -> None:
         super().__init__(api, data)
+        self.user = None
+        self.moderator = None
 
     async def _fetch_users(self) -> None:
         self.user = await self._api.client.get_or_fetch_user(self.user_id)
         self.moderator = await self._api.client.get_or_fetch_user(self.moderator_id)
 
+    def _set_users(self, users: Dict[int, Optional[User]]) -> None:
+        """Sets user and moderator objects from a dictionary of already resolved users."""
+        self.user = users.get(self.user_id)
+        self.moderator = users.get(self.moderator_id)
+
     @property
     def user_name(self) -> str:
         """Returns user name. Priority is given to the one saved in the database."""
@@ -161,12 +170,94 @@ class Case(BaseCase):
         await self._update()
 
 
-class CasePaginator(ListPageSource):
-    def __init__(self, paginator_title: str, cases: List[Case], compact: bool = False):
-        super().__init__(cases, per_page=6)
+class CasePageSource(PageSource):
+    """A page source which fetches pages of cases from the database on demand."""
+
+    def __init__(
+        self,
+        api: API,
+        paginator_title: str,
+        guild_id: int, user_id: int,
+        case_count: int,
+        compact: bool = False,
+        warnings_only: bool = False, active_only: bool = False
+    ):
+        self._api = api
+        self.guild_id = guild_id
+        self.user_id = user_id
+        self.case_count = case_count
+        self.per_page = 6
         self.compact = compact
+        self.warnings_only = warnings_only
+        self.active_only = active_only
         self.embed = PidroidEmbed(title=paginator_title)
 
+        # Pages which are fetched or being fetched, keyed by page number
+        self._pages: Dict[int, asyncio.Task[List[Case]]] = {}
+
+        pages, left_over = divmod(case_count, self.per_page)
+        if left_over:
+            pages += 1
+        self._max_pages = pages
+
+    def is_paginating(self) -> bool:
+        return self.case_count > self.per_page
+
+    def get_max_pages(self) -> int:
+        return self._max_pages
+
+    async def get_page(self, page_number: int) -> List[Case]:
+        page = await self._get_page_task(page_number)
+        # Prefetch the following page while the current one is being read
+        if page_number + 1 < self._max_pages:
+            self._get_page_task(page_number + 1)
+        return page
+
+    def _get_page_task(self, page_number: int) -> asyncio.Task[List[Case]]:
+        """Returns the task which fetches the specified page, creating it if necessary."""
+        task = self._pages.get(page_number)
+        if task is None:
+            task = asyncio.create_task(self._fetch_page(page_number))
+            task.add_done_callback(lambda t: self._discard_failed_page(page_number, t))
+            self._pages[page_number] = task
+        return task
+
+    def _discard_failed_page(self, page_number: int, task: asyncio.Task[List[Case]]) -> None:
+        """Forgets a page which failed to be fetched, so that it could be fetched again later."""
+        if not task.cancelled() and task.exception() is None:
+            return
+        if self._pages.get(page_number) is task:
+            del self._pages[page_number]
+
+    async def _fetch(self, limit: int, cursor: Optional[Case] = None, newer: bool = False) -> List[Case]:
+        return await self._api.fetch_case_page(
+            self.guild_id, self.user_id, limit,
+            None if cursor is None else (cursor.date_issued, cursor._id), newer,
+            self.warnings_only, self.active_only
+        )
+
+    async def _fetch_page(self, page_number: int) -> List[Case]:
+        """Fetches the specified page by continuing from one of its neighbouring pages."""
+        if page_number == 0:
+            return await self._fetch(self.per_page)
+
+        if page_number - 1 not in self._pages:
+            following = self._pages.get(page_number + 1)
+            if following is not None:
+                following_page = await following
+                # The following page is empty if cases were revoked since counting them
+                if len(following_page) > 0:
+                    return await self._fetch(self.per_page, following_page[0], newer=True)
+
+            # The last page can be read from the other end of the list
+            if page_number == self._max_pages - 1:
+                return await self._fetch(self.case_count - page_number * self.per_page, newer=True)
+
+        previous = await self._get_page_task(page_number - 1)
+        if len(previous) == 0:
+            raise IndexError
+        return await self._fetch(self.per_page, previous[-1])
+
     async def format_page(self, menu: PidroidPages, cases: List[Case]) -> Embed:
         self.embed.clear_fields()
         for case in cases:
@@ -181,7 +272,7 @@ class CasePaginator(ListPageSource):
                     f"**Reason:** {case.clean_reason.capitalize()}"
                 )
             self.embed.add_field(name=name, value=value, inline=False)
-        self.embed.set_footer(text=f'{len(self.entries)} entry(-ies)')
+        self.embed.set_footer(text=f'{self.case_count} entry(-ies)')
         return self.embed
 
 class BasePunishment:
@@ -254,18 +345,30 @@ class BasePunishment:
             raise BadArgument("Your reason is too long. Please make sure it's below or equal to 512 characters!")
         self._reason = reason
 
-    async def _create_db_entry(self) -> Case:
-        return await self._api.insert_punishment_entry(
+    async def _create_db_entry(self, session: Optional[AsyncSession] = None) -> Case:
+        case = await self._api.insert_punishment_entry(
             self.type,
             self.guild.id,
             self.user.id, self.user_name,
             self.moderator.id, self.moderator_name,
-            self.reason, self.expiration_date
+            self.reason, self.expiration_date,
+            session
         )
-
-    async def _revoke_punishment_db_entry(self, type: str) -> None:
-        """Removes all punishments of specified type for the current user."""
-        await self._api.revoke_cases_by_type(type, self.guild.id, self.user.id)
+        # We already have both users, there's no need to look them up again
+        case._set_users({self.user.id: self.user, self.moderator.id: self.moderator}) # type: ignore
+        return case
+
+    async def _revoke_punishment_db_entry(self, *types: str, session: Optional[AsyncSession] = None) -> None:
+        """Removes all punishments of specified types for the current user."""
+        await self._api.revoke_cases_by_types(list(types), self.guild.id, self.user.id, session)
+
+    async def _replace_punishment_db_entries(self, *types: str) -> Case:
+        """Removes all punishments of specified types for the current user and creates
+        a new database entry for the case in a single transaction."""
+        async with self._api.transaction() as session:
+            await self._revoke_punishment_db_entry(*types, session=session)
+            case = await self._create_db_entry(session)
+        return case
 
     """Would rather stick these user notification features into an event listener of sorts."""
     async def _notify_chat(self, message: str, image_file: Optional[File] = None):
@@ -404,10 +507,7 @@ class Ban(BasePunishment):
 
     async def create_entry(self) -> Case:
         """Creates new database entry for the case."""
-        await self._revoke_punishment_db_entry("jail")
-        await self._revoke_punishment_db_entry("mute")
-        await self._revoke_punishment_db_entry("timeout")
-        return await self._create_db_entry()
+        return await self._replace_punishment_db_entries("jail", "mute", "timeout")
 
     async def issue(self) -> Case:
         """Bans the user and creates new database entry."""
@@ -460,10 +560,7 @@ class Kick(BasePunishment):
         return embed
 
     async def create_entry(self) -> Case:
-        await self._revoke_punishment_db_entry('jail')
-        await self._revoke_punishment_db_entry('mute')
-        await self._revoke_punishment_db_entry('timeout')
-        return await self._create_db_entry()
+        return await self._replace_punishment_db_entries('jail', 'mute', 'timeout')
 
     async def issue(self) -> Case:
         await self.user.kick(reason=self.audit_log_issue_reason)
@@ -26,6 +26,18 @@ class ClientIsNotPidroid(CheckFailure):
 class APIException(BadArgument):
     """Called when TheoTown API error is encountered"""
     def __init__(self, status: int, message: Optional[str] = None):
+        self.status = status
         if message is None:
             return super().__init__(f"An error has been encountered inside TheoTown API, status code: {status}")
         return super().__init__(message)
+
+class APIUnavailable(APIException):
+    """Called when requests to TheoTown API are not sent because the API is failing"""
+    def __init__(self):
+        super().__init__(503, "TheoTown API is currently unavailable. Please try again later!")
+
+class ResponseTooLarge(BadArgument):
+    """Called when a downloaded file exceeds the allowed size"""
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(f"The file is too big! Please upload files below {max_size // 1_000_000} MBs")
@@ -1,14 +1,27 @@
 from __future__ import annotations
 
+import time
+
+from bisect import bisect_left
 from discord.embeds import Embed
 from discord.utils import escape_markdown
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set
 
 from pidroid.cogs.utils.embeds import PidroidEmbed
-from pidroid.cogs.utils.parsers import clean_inline_translations, format_version_code, truncate_string
+from pidroid.cogs.utils.parsers import clean_inline_translations, format_version_code, get_deletion_variants, tokenize, truncate_string
 
 URL_TO_USER = 'https://forum.theotown.com/memberlist.php?mode=viewprofile&u='
 
+# Minimum length of a query word for it to also match words with a single typo
+FUZZY_TOKEN_MIN_LENGTH = 4
+# Maximum amount of plugins returned by a plugin index search
+PLUGIN_SEARCH_LIMIT = 100
+
+# Scores of a query word matching a plugin word exactly, as a prefix or with a typo
+EXACT_MATCH_SCORE = 3
+PREFIX_MATCH_SCORE = 2
+FUZZY_MATCH_SCORE = 1
+
 
 class Platforms:
     ANDROID = 1 << 0
@@ -151,3 +164,132 @@ class NewPlugin(Plugin):
     def time(self) -> int:
         """Returns plugin approval time."""
         return self._time
+
+class PluginIndex:
+    """This class implements an in-memory inverted index of plugin store plugins over their titles and authors."""
+
+    def __init__(self) -> None:
+        self.seeded_at: Optional[float] = None
+        # Whether the seed is known to contain every plugin, so that searches without hits need no API fallback
+        self.complete = False
+        self._plugins: Dict[int, Plugin] = {}
+        # Times of plugins being updated after the index was seeded
+        self._updated_at: Dict[int, float] = {}
+        self._plugin_tokens: Dict[int, Set[str]] = {}
+        # Maps words to IDs of plugins containing them
+        self._postings: Dict[str, Set[int]] = {}
+        # Maps deletion variants to words they were produced from, used for typo tolerant matching
+        self._variants: Dict[str, Set[str]] = {}
+        # Sorted list of words used for prefix matching, rebuilt lazily after words change
+        self._sorted_tokens: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._plugins)
+
+    @property
+    def is_seeded(self) -> bool:
+        """Returns true if the index was seeded."""
+        return self.seeded_at is not None
+
+    @property
+    def is_complete(self) -> bool:
+        """Returns true if the index was seeded with every plugin."""
+        return self.is_seeded and self.complete
+
+    def get(self, plugin_id: int) -> Optional[Plugin]:
+        """Returns the indexed plugin by the specified ID."""
+        return self._plugins.get(plugin_id, None)
+
+    def update(self, plugins: Iterable[Plugin]) -> None:
+        """Adds the plugins to the index, replacing any previously indexed revisions of them."""
+        now = time.monotonic()
+        for plugin in plugins:
+            self._remove(plugin.id)
+            self._add(plugin)
+            self._updated_at[plugin.id] = now
+
+    @classmethod
+    def build(cls, plugins: Iterable[Plugin], complete: bool) -> PluginIndex:
+        """Returns a new seeded index of the specified plugins.
+
+        Building an index of the whole plugin store takes a while, so it's meant to be run in an executor."""
+        index = cls()
+        index.complete = complete
+        for plugin in plugins:
+            index._add(plugin)
+        index._sorted_tokens = sorted(index._postings)
+        index.seeded_at = time.monotonic()
+        return index
+
+    def merge_updates(self, other: PluginIndex, since: float) -> None:
+        """Adds plugins which were updated in the other index since the specified time."""
+        self.update([p for i, p in other._plugins.items() if other._updated_at.get(i, since - 1) >= since])
+
+    def search(self, query: str) -> List[Plugin]:
+        """Returns plugins which match every word of the query, best matches first."""
+        scores: Optional[Dict[int, int]] = None
+        for token in tokenize(query):
+            token_scores = self._match(token)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {i: score + token_scores[i] for i, score in scores.items() if i in token_scores}
+            if not scores:
+                return []
+
+        if scores is None:
+            return []
+        ranked = sorted(scores, key=lambda i: (-scores[i], self._plugins[i].clean_title.lower())) # type: ignore
+        return [self._plugins[i] for i in ranked[:PLUGIN_SEARCH_LIMIT]]
+
+    def _match(self, token: str) -> Dict[int, int]:
+        """Returns a dictionary of IDs of plugins matching the query word and their match scores."""
+        scores: Dict[int, int] = {}
+
+        def add(plugin_ids: Iterable[int], score: int) -> None:
+            for plugin_id in plugin_ids:
+                if scores.get(plugin_id, 0) < score:
+                    scores[plugin_id] = score
+
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._postings)
+        i = bisect_left(self._sorted_tokens, token)
+        while i < len(self._sorted_tokens) and self._sorted_tokens[i].startswith(token):
+            word = self._sorted_tokens[i]
+            add(self._postings[word], EXACT_MATCH_SCORE if word == token else PREFIX_MATCH_SCORE)
+            i += 1
+
+        if len(token) >= FUZZY_TOKEN_MIN_LENGTH:
+            for variant in get_deletion_variants(token):
+                for word in self._variants.get(variant, ()):
+                    add(self._postings[word], FUZZY_MATCH_SCORE)
+        return scores
+
+    def _add(self, plugin: Plugin) -> None:
+        tokens = set(tokenize(plugin.clean_title) + tokenize(plugin.author.username))
+        self._plugins[plugin.id] = plugin
+        self._plugin_tokens[plugin.id] = tokens
+        for token in tokens:
+            if token not in self._postings:
+                self._postings[token] = set()
+                self._sorted_tokens = None
+                for variant in get_deletion_variants(token):
+                    self._variants.setdefault(variant, set()).add(token)
+            self._postings[token].add(plugin.id)
+
+    def _remove(self, plugin_id: int) -> None:
+        if self._plugins.pop(plugin_id, None) is None:
+            return
+        self._updated_at.pop(plugin_id, None)
+        for token in self._plugin_tokens.pop(plugin_id):
+            postings = self._postings[token]
+            postings.discard(plugin_id)
+            if postings:
+                continue
+            del self._postings[token]
+            self._sorted_tokens = None
+            for variant in get_deletion_variants(token):
+                words = self._variants[variant]
+                words.discard(token)
+                if not words:
+                    del self._variants[variant]
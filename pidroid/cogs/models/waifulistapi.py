@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-import httpx
 import urllib.parse
 
+from aiohttp import ClientSession
 from enum import Enum
 from io import StringIO
 from lxml import etree # type: ignore # nosec
-from httpx._models import Response
 from typing import Any, TYPE_CHECKING, Dict, Optional, List, Union
 
 from pidroid.cogs.models.exceptions import APIException
@@ -183,21 +182,22 @@ class Waifu:
 
 class MyWaifuListAPI:
 
-    def __init__(self) -> None:
+    def __init__(self, session: ClientSession) -> None:
         """Initializes API instance."""
         self._xsrf_token: Optional[str] = None
         self._csrf_token: Optional[str] = None
         self._forever_alone_session: Optional[str] = None
-        self.client = httpx.AsyncClient(http2=True)
+        self.session = session
         self.search_cache: Dict[str, List[Union[WaifuSearchResult, SeriesSearchResult, SearchResult]]] = {}
         self.waifu_cache: Dict[int, Waifu] = {}
 
     async def _acquire_tokens_for_forgery(self) -> None:
         """Sends a GET request to dash page to acquire tokens for forgery."""
-        r = await self.client.get(BASE_URL + "/dash")
-        tree = etree.parse(StringIO(r.text), PARSER) # nosec
-        self._xsrf_token = r.cookies["XSRF-TOKEN"]
-        self._forever_alone_session = r.cookies["forever_alone_session"]
+        async with self.session.get(BASE_URL + "/dash") as r:
+            text = await r.text()
+        tree = etree.parse(StringIO(text), PARSER) # nosec
+        self._xsrf_token = r.cookies["XSRF-TOKEN"].value
+        self._forever_alone_session = r.cookies["forever_alone_session"].value
         self._csrf_token = tree.xpath("//meta[@name='csrf-token']")[0].attrib['content']
 
     async def reauthorize(self) -> None:
@@ -246,31 +246,33 @@ class MyWaifuListAPI:
             "x-xsrf-token": urllib.parse.unquote(await self.xsrf_token)
         }
 
-    async def get(self, endpoint: str) -> Response:
-        """Sends a GET request to Mywaifulist API endpoint."""
-        r = await self.client.get(
+    async def get(self, endpoint: str) -> Any:
+        """Sends a GET request to Mywaifulist API endpoint and returns the response JSON."""
+        async with self.session.get(
             API_URL + endpoint,
             headers=await self.forged_headers, cookies=await self.forged_cookies
-        )
-        return r
+        ) as r:
+            return await r.json()
 
-    async def post(self, endpoint: str, json: dict, attempts: int = 0) -> Response:
-        """Sends a POST request to Mywaifulist API endpoint."""
-        r = await self.client.post(
+    async def post(self, endpoint: str, json: dict, attempts: int = 0) -> Any:
+        """Sends a POST request to Mywaifulist API endpoint and returns the response JSON."""
+        async with self.session.post(
             API_URL + endpoint, json=json,
             headers=await self.forged_headers, cookies=await self.forged_cookies
-        )
-        if r.status_code == 419:
-            if attempts > 2:
-                raise APIException(401, 'Re-authorization attempts have failed. Try again later.')
-            await self.reauthorize()
-            return await self.post(endpoint, json, attempts + 1)
-        return r
+        ) as r:
+            if r.status != 419:
+                return await r.json()
+
+        if attempts > 2:
+            raise APIException(401, 'Re-authorization attempts have failed. Try again later.')
+        await self.reauthorize()
+        return await self.post(endpoint, json, attempts + 1)
 
     async def fetch_random_waifu(self) -> Waifu:
         """Returns a random waifu."""
-        r = await self.client.get(f"{BASE_URL}/random", headers=await self.forged_headers, follow_redirects=True)
-        tree = etree.parse(StringIO(r.text), PARSER) # nosec
+        async with self.session.get(f"{BASE_URL}/random", headers=await self.forged_headers) as r:
+            text = await r.text()
+        tree = etree.parse(StringIO(text), PARSER) # nosec
         waifu_id = tree.xpath("//waifu-core")[0].attrib[':waifu-id']
         waifu = await self.fetch_waifu_by_id(waifu_id)
         return waifu
@@ -281,8 +283,8 @@ class MyWaifuListAPI:
         if waifu:
             return waifu
 
-        r = await self.get(f"/waifu/{id}")
-        waifu = Waifu(r.json()["data"])
+        data = await self.get(f"/waifu/{id}")
+        waifu = Waifu(data["data"])
         self.waifu_cache[id] = waifu
         return waifu
 
@@ -292,9 +294,9 @@ class MyWaifuListAPI:
         cached_res = self.search_cache.get(query)
         if cached_res:
             return cached_res
-        r = await self.post("/waifu/search", {"query": query})
+        data = await self.post("/waifu/search", {"query": query})
         results: List[Union[WaifuSearchResult, SeriesSearchResult, SearchResult]] = []
-        for i in r.json():
+        for i in data:
             if i["entity_type"] == "waifu":
                 results.append(WaifuSearchResult(self, i))
             elif i["entity_type"] == "series":
@@ -1,24 +1,35 @@
 from __future__ import annotations
 
+import asyncio
+import asyncpg # type: ignore
 import datetime
+import hashlib
+import time
+import uuid
 
-from typing import List, Optional, TYPE_CHECKING, Any, Coroutine, Dict, Set
+from contextlib import asynccontextmanager, suppress
+from discord.user import User
+from typing import List, Optional, TYPE_CHECKING, Any, AsyncIterator, Coroutine, Dict, Set, Tuple
 
-from pidroid.cogs.ext.commands.tags import Tag
-from pidroid.cogs.models.case import Case
+from pidroid.cogs.ext.commands.tags import Tag, TagCache
+from pidroid.cogs.models.case import BaseCase, Case
 from pidroid.cogs.models.configuration import GuildConfiguration
-from pidroid.cogs.models.plugins import NewPlugin, Plugin
+from pidroid.cogs.models.plugins import NewPlugin, Plugin, PluginIndex
 from pidroid.cogs.models.accounts import TheoTownAccount
 from pidroid.cogs.utils.http import HTTP, Route
+from pidroid.cogs.utils.pool import PoolStatistics, create_instrumented_pool_class, instrument_statement_cache
 from pidroid.cogs.utils.time import utcnow
 
 from sqlalchemy import Column # type: ignore
 from sqlalchemy import DateTime
-from sqlalchemy import func, delete, select, update
+from sqlalchemy import and_, cast, func, delete, insert, literal, select, tuple_, update
+from sqlalchemy import DDL, event
+from sqlalchemy import Index
 from sqlalchemy import Integer, BigInteger, Text, ARRAY, Boolean
-from sqlalchemy import String
+from sqlalchemy import String, text
 from sqlalchemy.dialects.postgresql import insert as pg_insert # type: ignore
 from sqlalchemy.engine.result import ChunkedIteratorResult # type: ignore
+from sqlalchemy.engine.url import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine # type: ignore
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import declarative_base # type: ignore
@@ -30,6 +41,24 @@ if TYPE_CHECKING:
 
 Base = declarative_base()
 
+# Maximum amount of concurrent user lookups when resolving users of a case list
+USER_RESOLUTION_CONCURRENCY = 5
+
+# Minimum trigram similarity for a tag to be suggested in place of a missing one
+TAG_SIMILARITY_THRESHOLD = 0.3
+
+# Postgres notification channel used for announcing guild configuration changes to every process
+GUILD_CONFIGURATION_CHANNEL = "pidroid_guild_configuration"
+# Postgres notification channel used for announcing guild tag changes to every process
+GUILD_TAGS_CHANNEL = "pidroid_guild_tags"
+# Delay in seconds before reconnecting a lost notification connection
+NOTIFICATION_RECONNECT_DELAY = 5
+
+# Time in seconds after which the plugin index is seeded again, so that removed plugins disappear from it
+PLUGIN_INDEX_MAX_AGE = 6 * 60 * 60
+# Maximum amount of new plugin pages requested when seeding the plugin index
+PLUGIN_INDEX_MAX_PAGES = 100
+
 class LinkedAccountTable(Base): # type: ignore
     __tablename__ = "LinkedAccounts"
 
@@ -38,6 +67,11 @@ class LinkedAccountTable(Base): # type: ignore
     forum_id = Column(BigInteger)
     date_wage_last_redeemed = Column(DateTime(timezone=True), nullable=True)
 
+    __table_args__ = (
+        Index("ix_linked_accounts_user_id", user_id, unique=True),
+        Index("ix_linked_accounts_forum_id", forum_id, unique=True),
+    )
+
 class PunishmentCounterTable(Base): # type: ignore
     __tablename__ = "PunishmentCounters"
 
@@ -68,6 +102,21 @@ class PunishmentTable(Base): # type: ignore
     handled = Column(Boolean, server_default="false")
     visible = Column(Boolean, server_default="true")
 
+    __table_args__ = (
+        # Case lookups and modlogs, ordered by issue date
+        Index("ix_punishments_guild_id_case_id", guild_id, case_id),
+        Index("ix_punishments_guild_id_user_id_issue_date", guild_id, user_id, issue_date),
+        # Punishment checks and revocations by type
+        Index("ix_punishments_guild_id_user_id_type", guild_id, user_id, type),
+        # Moderation statistics
+        Index("ix_punishments_guild_id_moderator_id", guild_id, moderator_id),
+        # Only unhandled punishments that can expire are of interest to the expiry scheduler
+        Index(
+            "ix_punishments_pending_expiration", expire_date,
+            postgresql_where=(handled == False) & expire_date.is_not(None)
+        ),
+    )
+
 class ExpiringThreadTable(Base): # type: ignore
     __tablename__ = "ExpiringThreads"
 
@@ -97,11 +146,25 @@ class TagTable(Base): # type: ignore
     locked = Column(Boolean, server_default="false")
     date_created = Column(DateTime(timezone=True), default=func.now())
 
+    __table_args__ = (
+        Index("ix_tags_guild_id_lower_name", guild_id, func.lower(name)),
+        Index("ix_tags_name_trgm", name, postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_tags_aliases_trgm", text("tag_aliases_text(aliases) gin_trgm_ops"), postgresql_using="gin"),
+    )
+
+# Trigram indexes require the pg_trgm extension
+event.listen(TagTable.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+# Trigram indexes can only be built on immutable expressions, which array_to_string is not
+event.listen(TagTable.__table__, "before_create", DDL(
+    "CREATE OR REPLACE FUNCTION tag_aliases_text(aliases text[]) RETURNS text "
+    "LANGUAGE sql IMMUTABLE AS $$ SELECT array_to_string(aliases, ' ') $$"
+))
+
 class GuildConfigurationTable(Base): # type: ignore
     __tablename__ = "GuildConfigurations"
 
     id = Column(BigInteger, primary_key=True)
-    guild_id = Column(BigInteger)
+    guild_id = Column(BigInteger, unique=True)
     jail_channel = Column(BigInteger, nullable=True)
     jail_role = Column(BigInteger, nullable=True)
     mute_role = Column(BigInteger, nullable=True) # Deprecated, only used for backwards compatibility
@@ -116,9 +179,34 @@ class TranslationTable(Base): # type: ignore
 
     id = Column(Integer, primary_key=True)
     original_content = Column(String)
+    content_hash = Column(String(32), nullable=False) # MD5 digest of the original content used for lookups
     detected_language = Column(String)
     translated_string = Column(String)
 
+    __table_args__ = (
+        Index("ix_translations_content_hash", content_hash, unique=True),
+    )
+
+def translation_content_hash(original_str: str) -> str:
+    """Returns a fixed size hash of a string, used as a key for looking up its translations."""
+    return hashlib.md5(original_str.encode("utf-8")).hexdigest()
+
+def active_case_clause() -> Any:
+    """Returns a filter clause matching cases which have not expired yet."""
+    return (PunishmentTable.handled == False) & (
+        (PunishmentTable.expire_date.is_(None))
+        | (PunishmentTable.expire_date > utcnow())
+    )
+
+def case_filter_clauses(warnings_only: bool, active_only: bool) -> List[Any]:
+    """Returns a list of filter clauses used for narrowing down case lists."""
+    clauses = []
+    if warnings_only:
+        clauses.append(PunishmentTable.type == "warning")
+    if active_only:
+        clauses.append(active_case_clause())
+    return clauses
+
 class API:
     """This class handles operations related to Pidroid's Postgres database and remote TheoTown API."""
 
@@ -128,6 +216,13 @@ class API:
         self._debug = debug
         self._http = HTTP(client)
         self.engine: Optional[AsyncEngine] = None
+        self.notification_listener: Optional[asyncio.Task] = None
+        # Identifies notifications sent by this process, as it applies its own changes to its cache directly
+        self._notification_token = uuid.uuid4().hex
+        self.tag_cache = TagCache(self)
+        self.pool_statistics = PoolStatistics()
+        self.plugin_index = PluginIndex()
+        self._plugin_index_task: Optional[asyncio.Task] = None
 
         self._listeners: Dict[str, Set[Coroutine]] = {}  
 
@@ -148,8 +243,150 @@ class API:
             self.client.loop.create_task(listener(*args, **kwargs))
 
     async def connect(self) -> None:
-        self.engine = create_async_engine(self._dsn, echo=self._debug)
+        config = self.client.config
+        self.engine = create_async_engine(
+            self._dsn, echo=self._debug,
+            poolclass=create_instrumented_pool_class(self.pool_statistics),
+            pool_size=config.get("postgres_pool_size", 5),
+            max_overflow=config.get("postgres_max_overflow", 10),
+            pool_timeout=config.get("postgres_pool_timeout", 30),
+            pool_recycle=config.get("postgres_pool_recycle", -1),
+            pool_pre_ping=config.get("postgres_pool_pre_ping", False),
+            connect_args={"prepared_statement_cache_size": config.get("postgres_statement_cache_size", 100)}
+        )
+        instrument_statement_cache(self.engine.sync_engine, self.pool_statistics)
         self.session = sessionmaker(self.engine, expire_on_commit=False, class_=AsyncSession)
+        self.notification_listener = self.client.loop.create_task(self._listen_for_notifications())
+
+    async def close(self) -> None:
+        """Stops listening for database notifications and closes all database connections."""
+        for task in (self.notification_listener, self._plugin_index_task):
+            if task is not None and not task.done():
+                task.cancel()
+                # The notification connection is closed by the task itself once it's cancelled
+                with suppress(asyncio.CancelledError):
+                    await task
+        self.notification_listener = None
+        if self.engine is not None:
+            await self.engine.dispose()
+
+    async def _listen_for_notifications(self) -> None:
+        """Listens for database notifications on a dedicated connection, reconnecting whenever it's lost.
+
+        Guild configuration change notifications of other processes are emitted as on_guild_configuration_changed events,
+        tag change notifications invalidate the cached tags of the guild.
+        As notifications sent while disconnected are lost, on_guild_configurations_stale is emitted
+        and the tag cache is cleared after reconnecting."""
+        dsn = make_url(self._dsn).set(drivername="postgresql").render_as_string(hide_password=False)
+        reconnecting = False
+        while True:
+            try:
+                connection = await asyncpg.connect(dsn)
+            except Exception:
+                self.client.logger.exception("Failed to open the database notification connection")
+                await asyncio.sleep(NOTIFICATION_RECONNECT_DELAY)
+                continue
+
+            connection_lost = asyncio.Event()
+            connection.add_termination_listener(lambda _: connection_lost.set())
+            try:
+                await connection.add_listener(GUILD_CONFIGURATION_CHANNEL, self._on_guild_configuration_notification)
+                await connection.add_listener(GUILD_TAGS_CHANNEL, self._on_guild_tags_notification)
+                if reconnecting:
+                    self.emit("on_guild_configurations_stale")
+                    self.tag_cache.clear()
+                await connection_lost.wait()
+            except Exception:
+                self.client.logger.exception("An exception was encountered while listening for database notifications")
+            finally:
+                if not connection.is_closed():
+                    await connection.close()
+
+            self.client.logger.warning("Database notification connection was lost, reconnecting")
+            reconnecting = True
+            await asyncio.sleep(NOTIFICATION_RECONNECT_DELAY)
+
+    def _on_guild_configuration_notification(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        token, _, guild_id = payload.rpartition(":")
+        if token != self._notification_token:
+            self.emit("on_guild_configuration_changed", int(guild_id))
+
+    def _on_guild_tags_notification(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        token, _, guild_id = payload.rpartition(":")
+        if token != self._notification_token:
+            self.tag_cache.invalidate(int(guild_id))
+
+    async def _notify_guild_tags_changed(self, session: AsyncSession, guild_id: int) -> None:
+        """Notifies every other process that the guild tags have changed, once the transaction is committed."""
+        await session.execute(select(func.pg_notify(GUILD_TAGS_CHANNEL, f"{self._notification_token}:{guild_id}")))
+
+    async def _notify_guild_configuration_changed(self, session: AsyncSession, *guild_ids: int) -> None:
+        """Notifies every other process that the guild configurations have changed, once the transaction is committed."""
+        ids = func.unnest(cast(list(guild_ids), ARRAY(BigInteger))).table_valued("guild_id")
+        payload = cast(f"{self._notification_token}:", Text) + cast(ids.c.guild_id, Text)
+        await session.execute(select(func.pg_notify(GUILD_CONFIGURATION_CHANNEL, payload)))
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[AsyncSession]:
+        """Opens a session with a transaction which is committed once the context manager exits.
+
+        The session can be passed to API methods which accept it, so that their
+        changes are applied together in a single transaction."""
+        async with self.session() as session: # type: ignore
+            assert isinstance(session, AsyncSession)
+            async with session.begin():
+                yield session
+
+    @asynccontextmanager
+    async def _join_transaction(self, session: Optional[AsyncSession]) -> AsyncIterator[AsyncSession]:
+        """Joins the specified session or opens a new transaction, if no session was specified."""
+        if session is not None:
+            yield session
+            return
+
+        async with self.transaction() as new_session:
+            yield new_session
+
+    async def warm_up_pool(self, connection_count: int) -> None:
+        """Opens the specified amount of connections ahead of time, so that they are ready in the pool."""
+        assert self.engine is not None
+        # Connections above the pool size would be closed as soon as they're returned
+        connection_count = min(connection_count, self.engine.sync_engine.pool.size()) # type: ignore
+        connections = await asyncio.gather(*[self.engine.connect().start() for _ in range(connection_count)])
+        for connection in connections:
+            await connection.close()
+
+    def get_pool_status(self) -> dict:
+        """Returns a dictionary describing the current state of the connection pool."""
+        assert self.engine is not None
+        pool = self.engine.sync_engine.pool
+        return {
+            "size": pool.size(), # type: ignore
+            "checked_out": pool.checkedout(), # type: ignore
+            "checked_in": pool.checkedin(), # type: ignore
+            "overflow": max(pool.overflow(), 0), # type: ignore
+            "checkouts": self.pool_statistics.checkouts,
+            "average_wait": self.pool_statistics.average_wait,
+            "max_wait": self.pool_statistics.max_wait,
+            "wait_histogram": self.pool_statistics.wait_histogram,
+            "statement_hit_rate": self.pool_statistics.statement_hit_rate
+        }
+
+    def get_response_cache_status(self) -> dict:
+        """Returns a dictionary describing the current state of the TheoTown API response cache."""
+        cache = self._http.cache
+        return {
+            "size": len(cache),
+            "max_size": cache.max_size,
+            "hits": cache.hits,
+            "stale_hits": cache.stale_hits,
+            "misses": cache.misses,
+            "hit_rate": cache.hit_rate
+        }
+
+    def get_circuit_breaker_state(self) -> str:
+        """Returns the state of the TheoTown API circuit breaker."""
+        return self._http.get_circuit_breaker(Route.host_name()).state
 
     async def get(self, route: Route) -> dict:
         """Sends a GET request to the TheoTown API."""
@@ -172,7 +409,11 @@ class API:
 
     """Tag related"""
 
-    async def insert_tag(self, guild_id: int, name: str, content: str, authors: List[int]) -> int:
+    async def insert_tag(
+        self,
+        guild_id: int, name: str, content: str, authors: List[int],
+        date_created: Optional[datetime.datetime] = None
+    ) -> int:
         """Creates a tag entry in the database."""
         async with self.session() as session: # type: ignore
             assert isinstance(session, AsyncSession)
@@ -181,39 +422,55 @@ class API:
                     guild_id=guild_id,
                     name=name,
                     content=content,
-                    authors=authors
+                    authors=authors,
+                    date_created=date_created or utcnow()
                 )
                 session.add(entry)
+                await self._notify_guild_tags_changed(session, guild_id)
             await session.commit()
         return entry.id # type: ignore
 
     async def fetch_guild_tag(self, guild_id: int, tag_name: str) -> Optional[Tag]:
-        """Returns a guild tag for the appropriate name."""
-        async with self.session() as session: # type: ignore
-            assert isinstance(session, AsyncSession)
-            result: ChunkedIteratorResult = await session.execute(
-                select(TagTable).
-                filter(TagTable.guild_id == guild_id, TagTable.name.ilike(tag_name)).
-                order_by(TagTable.name.asc())
-            )
-        row = result.fetchone()
-        if row:
-            return Tag(self, row[0])
-        return None
+        """Returns a guild tag for the appropriate name or alias."""
+        tag = (await self.tag_cache.get_guild(guild_id)).get(tag_name)
+        if tag is None:
+            return None
+        return tag.copy()
 
     async def search_guild_tags(self, guild_id: int, tag_name: str) -> List[Tag]:
         """Returns all guild tags matching the appropriate name."""
+        return [t.copy() for t in (await self.tag_cache.get_guild(guild_id)).search(tag_name)]
+
+    async def suggest_guild_tags(self, guild_id: int, tag_name: str, limit: int = 5) -> List[str]:
+        """Returns names of guild tags which are the most similar to the appropriate name or alias."""
+        aliases = func.tag_aliases_text(TagTable.aliases)
+        score = func.greatest(func.similarity(TagTable.name, tag_name), func.word_similarity(tag_name, aliases))
         async with self.session() as session: # type: ignore
             assert isinstance(session, AsyncSession)
-            result: ChunkedIteratorResult = await session.execute(
-                select(TagTable).
-                filter(TagTable.guild_id == guild_id, TagTable.name.ilike(f'%{tag_name}%')).
-                order_by(TagTable.name.asc())
-            )
-        return [Tag(self, r[0]) for r in result.fetchall()]
+            async with session.begin():
+                # Thresholds of the similarity operators, which allow them to use the trigram indexes
+                threshold = str(TAG_SIMILARITY_THRESHOLD)
+                await session.execute(select(func.set_config('pg_trgm.similarity_threshold', threshold, True)))
+                await session.execute(select(func.set_config('pg_trgm.word_similarity_threshold', threshold, True)))
+                result: ChunkedIteratorResult = await session.execute(
+                    select(TagTable.name).
+                    filter(TagTable.guild_id == guild_id).
+                    filter(TagTable.name.op('%')(tag_name) | literal(tag_name).op('<%')(aliases)).
+                    order_by(score.desc(), TagTable.name.asc()).
+                    limit(limit)
+                )
+        return [r[0] for r in result.fetchall()]
 
     async def fetch_guild_tags(self, guild_id: int) -> List[Tag]:
         """Returns a list of all tags defined in the guild."""
+        return [t.copy() for t in (await self.tag_cache.get_guild(guild_id)).all()]
+
+    async def fetch_guild_tag_names(self, guild_id: int) -> List[str]:
+        """Returns an alphabetical list of names of all tags defined in the guild."""
+        return (await self.tag_cache.get_guild(guild_id)).names()
+
+    async def _fetch_guild_tags(self, guild_id: int) -> List[Tag]:
+        """Returns a list of all tags defined in the guild straight from the database."""
         async with self.session() as session: # type: ignore
             assert isinstance(session, AsyncSession)
             result: ChunkedIteratorResult = await session.execute(
@@ -228,7 +485,7 @@ class API:
         async with self.session() as session: # type: ignore
             assert isinstance(session, AsyncSession)
             async with session.begin():
-                await session.execute(
+                result: ChunkedIteratorResult = await session.execute(
                     update(TagTable).
                     filter(TagTable.id == row_id).
                     values(
@@ -236,8 +493,12 @@ class API:
                         authors=authors,
                         aliases=aliases,
                         locked=locked
-                    )
+                    ).
+                    returning(TagTable.guild_id)
                 )
+                guild_id = result.scalar()
+                if guild_id is not None:
+                    await self._notify_guild_tags_changed(session, guild_id)
             await session.commit()
 
     async def delete_tag(self, row_id: int) -> None:
@@ -245,7 +506,12 @@ class API:
         async with self.session() as session: # type: ignore
             assert isinstance(session, AsyncSession)
             async with session.begin():
-                await session.execute(delete(TagTable).filter(TagTable.id == row_id))
+                result: ChunkedIteratorResult = await session.execute(
+                    delete(TagTable).filter(TagTable.id == row_id).returning(TagTable.guild_id)
+                )
+                guild_id = result.scalar()
+                if guild_id is not None:
+                    await self._notify_guild_tags_changed(session, guild_id)
             await session.commit()
 
     """Guild configuration related"""
@@ -267,11 +533,33 @@ class API:
                     log_channel=log_channel
                 )
                 session.add(entry)
+                await self._notify_guild_configuration_changed(session, guild_id)
             await session.commit()
         config = await self.fetch_guild_configuration_by_id(entry.id) # type: ignore
         assert config is not None
         return config
 
+    async def insert_guild_configurations(self, guild_ids: List[int]) -> List[GuildConfiguration]:
+        """Inserts minimal guild configuration entries for guilds which do not have one yet
+        using a single statement and returns the inserted configurations."""
+        if len(guild_ids) == 0:
+            return []
+
+        async with self.session() as session: # type: ignore
+            assert isinstance(session, AsyncSession)
+            async with session.begin():
+                result: ChunkedIteratorResult = await session.execute(
+                    pg_insert(GuildConfigurationTable).
+                    values([dict(guild_id=guild_id) for guild_id in guild_ids]).
+                    on_conflict_do_nothing(index_elements=[GuildConfigurationTable.guild_id]).
+                    returning(*GuildConfigurationTable.__table__.columns)
+                )
+                configs = [GuildConfiguration(self, r) for r in result.fetchall()]
+                if len(configs) > 0:
+                    await self._notify_guild_configuration_changed(session, *[c.guild_id for c in configs])
+            await session.commit()
+        return configs
+
     async def fetch_guild_configuration_by_id(self, id: int) -> Optional[GuildConfiguration]:
         """Fetches and returns a deserialized guild configuration if available."""
         async with self.session() as session: # type: ignore
@@ -321,7 +609,7 @@ class API:
         async with self.session() as session: # type: ignore
             assert isinstance(session, AsyncSession)
             async with session.begin():
-                await session.execute(
+                result: ChunkedIteratorResult = await session.execute(
                     update(GuildConfigurationTable).
                     filter(GuildConfigurationTable.id == row_id).
                     values(
@@ -332,8 +620,12 @@ class API:
                         prefixes=prefixes,
                         suspicious_usernames=suspicious_usernames,
                         public_tags=public_tags
-                    )
+                    ).
+                    returning(GuildConfigurationTable.guild_id)
                 )
+                guild_id = result.scalar()
+                if guild_id is not None:
+                    await self._notify_guild_configuration_changed(session, guild_id)
             await session.commit()
 
     async def delete_guild_configuration(self, row_id: int) -> None:
@@ -341,7 +633,14 @@ class API:
         async with self.session() as session: # type: ignore
             assert isinstance(session, AsyncSession)
             async with session.begin():
-                await session.execute(delete(GuildConfigurationTable).filter(GuildConfigurationTable.id == row_id))
+                result: ChunkedIteratorResult = await session.execute(
+                    delete(GuildConfigurationTable).
+                    filter(GuildConfigurationTable.id == row_id).
+                    returning(GuildConfigurationTable.guild_id)
+                )
+                guild_id = result.scalar()
+                if guild_id is not None:
+                    await self._notify_guild_configuration_changed(session, guild_id)
             await session.commit()
 
     """Expiring thread related"""
@@ -380,36 +679,36 @@ class API:
         user_id: int, user_name: str,
         moderator_id: int, moderator_name: str,
         reason: Optional[str],
-        expire_date: Optional[datetime.datetime]
+        expire_date: Optional[datetime.datetime],
+        session: Optional[AsyncSession] = None
     ) -> Case:
-        async with self.session() as session: # type: ignore
-            assert isinstance(session, AsyncSession)
-            async with session.begin():
-                insert_stmt = pg_insert(PunishmentCounterTable).values(guild_id=guild_id).on_conflict_do_update(
-                    index_elements=[PunishmentCounterTable.guild_id],
-                    set_=dict(counter=PunishmentCounterTable.counter + 1) # TODO: investigate 
-                ).returning(PunishmentCounterTable.counter)
-
-                res = await session.execute(insert_stmt)
-                counter = res.fetchone()[0]
-
-                entry = PunishmentTable(
-                    case_id=counter,
-                    type=type,
-                    guild_id=guild_id,
-                    user_id=user_id,
-                    user_name=user_name,
-                    moderator_id=moderator_id,
-                    moderator_name=moderator_name,
-                    reason=reason,
-                    expire_date=expire_date
-                )
-                session.add(entry)
-            await session.commit()
-
-        case = await self.fetch_case_by_internal_id(entry.id) # type: ignore
-        assert case is not None
-        return case
+        """Creates a punishment entry in the database and returns it as a case.
+
+        The guild case counter is incremented and the case is inserted using a single statement.
+        Users of the returned case are not resolved."""
+        # The first case of a guild inserts its counter with the default value of 1, later cases increment
+        # the existing counter, whose row stays locked until commit, so concurrent cases get consecutive numbers
+        counter = pg_insert(PunishmentCounterTable).values(guild_id=guild_id).on_conflict_do_update(
+            index_elements=[PunishmentCounterTable.guild_id],
+            set_=dict(counter=PunishmentCounterTable.counter + 1)
+        ).returning(PunishmentCounterTable.counter).cte("counter")
+
+        insert_stmt = insert(PunishmentTable).add_cte(counter).values(
+            case_id=select(counter.c.counter).scalar_subquery(),
+            type=type,
+            guild_id=guild_id,
+            user_id=user_id,
+            user_name=user_name,
+            moderator_id=moderator_id,
+            moderator_name=moderator_name,
+            reason=reason,
+            expire_date=expire_date
+        ).returning(*PunishmentTable.__table__.columns)
+
+        async with self._join_transaction(session) as session:
+            result: ChunkedIteratorResult = await session.execute(insert_stmt)
+            row = result.fetchone()
+        return Case(self, row)
 
     async def fetch_case_by_internal_id(self, id: int) -> Optional[Case]:
         """Fetches and returns a deserialized case if available."""
@@ -443,35 +742,107 @@ class API:
 
     async def fetch_cases(self, guild_id: int, user_id: int) -> List[Case]:
         """Fetches and returns a list of deserialized cases."""
+        return await self._fetch_cases(guild_id, user_id)
+
+    async def _fetch_cases(self, guild_id: int, user_id: int, *filters: Any) -> List[Case]:
+        """Fetches and returns a list of deserialized cases matching the additional filters."""
         async with self.session() as session: # type: ignore
             assert isinstance(session, AsyncSession)
             result: ChunkedIteratorResult = await session.execute(
                 select(PunishmentTable).
                 filter(PunishmentTable.guild_id == guild_id, PunishmentTable.user_id == user_id, PunishmentTable.visible == True).
+                filter(*filters).
                 order_by(PunishmentTable.issue_date.desc())
             )
-        case_list = []
-        for r in result.fetchall():
-            c = Case(self, r[0])
-            await c._fetch_users()
-            case_list.append(c)
+        case_list = [Case(self, r[0]) for r in result.fetchall()]
+        await self._resolve_case_users(case_list)
         return case_list
 
+    async def _resolve_case_users(self, cases: List[Case]) -> None:
+        """Resolves users and moderators for a list of cases.
+
+        Every distinct user is looked up once, concurrently, and only if the case
+        does not already have the respective name stored in the database."""
+        user_ids: Set[int] = set()
+        for case in cases:
+            if case._user_name is None:
+                user_ids.add(case.user_id)
+            if case._moderator_name is None:
+                user_ids.add(case.moderator_id)
+
+        semaphore = asyncio.Semaphore(USER_RESOLUTION_CONCURRENCY)
+
+        async def resolve(user_id: int) -> Tuple[int, Optional[User]]:
+            async with semaphore:
+                return user_id, await self.client.get_or_fetch_user(user_id)
+
+        users: Dict[int, Optional[User]] = dict(await asyncio.gather(*[resolve(user_id) for user_id in user_ids]))
+        for case in cases:
+            case._set_users(users)
+
     async def fetch_active_cases(self, guild_id: int, user_id: int) -> List[Case]:
         """Returns a list of active cases for the specified guild and user."""
-        return [c for c in await self.fetch_cases(guild_id, user_id) if not c.has_expired]
+        return await self._fetch_cases(guild_id, user_id, active_case_clause())
 
     async def fetch_warnings(self, guild_id: int, user_id: int) -> List[Case]:
         """Returns a list of warnings for the specified guild and user."""
-        return [c for c in await self.fetch_cases(guild_id, user_id) if c.type == "warning"]
+        return await self._fetch_cases(guild_id, user_id, PunishmentTable.type == "warning")
 
     async def fetch_active_warnings(self, guild_id: int, user_id: int) -> List[Case]:
         """Returns a list of active warnings for the specified guild and user."""
-        return [
-            c
-            for c in await self.fetch_cases(guild_id, user_id)
-            if c.type == "warning" and not c.has_expired
-        ]
+        return await self._fetch_cases(guild_id, user_id, PunishmentTable.type == "warning", active_case_clause())
+
+    async def count_cases(
+        self,
+        guild_id: int, user_id: int,
+        warnings_only: bool = False, active_only: bool = False
+    ) -> int:
+        """Returns the amount of cases for the specified guild and user."""
+        async with self.session() as session: # type: ignore
+            assert isinstance(session, AsyncSession)
+            result: ChunkedIteratorResult = await session.execute(
+                select(func.count(PunishmentTable.id)).
+                filter(PunishmentTable.guild_id == guild_id, PunishmentTable.user_id == user_id, PunishmentTable.visible == True).
+                filter(*case_filter_clauses(warnings_only, active_only))
+            )
+        return result.scalar() or 0
+
+    async def fetch_case_page(
+        self,
+        guild_id: int, user_id: int,
+        limit: int,
+        cursor: Optional[Tuple[datetime.datetime, int]] = None,
+        newer: bool = False,
+        warnings_only: bool = False, active_only: bool = False
+    ) -> List[Case]:
+        """Returns a page of cases ordered from the newest to the oldest one.
+
+        Pages are fetched using keyset pagination on the issue date and the internal ID.
+        If a cursor is specified, only the cases issued before it are returned,
+        or after it, if newer is set to true. Without a cursor, newer returns the oldest cases."""
+        key = tuple_(PunishmentTable.issue_date, PunishmentTable.id)
+        stmt = (
+            select(PunishmentTable).
+            filter(PunishmentTable.guild_id == guild_id, PunishmentTable.user_id == user_id, PunishmentTable.visible == True).
+            filter(*case_filter_clauses(warnings_only, active_only))
+        )
+        if newer:
+            if cursor is not None:
+                stmt = stmt.filter(key > tuple_(*cursor))
+            stmt = stmt.order_by(PunishmentTable.issue_date.asc(), PunishmentTable.id.asc())
+        else:
+            if cursor is not None:
+                stmt = stmt.filter(key < tuple_(*cursor))
+            stmt = stmt.order_by(PunishmentTable.issue_date.desc(), PunishmentTable.id.desc())
+
+        async with self.session() as session: # type: ignore
+            assert isinstance(session, AsyncSession)
+            result: ChunkedIteratorResult = await session.execute(stmt.limit(limit))
+        case_list = [Case(self, r[0]) for r in result.fetchall()]
+        if newer:
+            case_list.reverse()
+        await self._resolve_case_users(case_list)
+        return case_list
 
     async def update_case_by_internal_id(
         self,
@@ -500,59 +871,71 @@ class API:
     async def revoke_cases_by_type(
         self,
         type: str,
-        guild_id: int, user_id: int
+        guild_id: int, user_id: int,
+        session: Optional[AsyncSession] = None
     ) -> None:
         """Revokes a case entry by making it expired using the specified type, user ID and guild ID."""
-        async with self.session() as session: # type: ignore
-            assert isinstance(session, AsyncSession)
-            async with session.begin():
-                await session.execute(
-                    update(PunishmentTable).
-                    filter(PunishmentTable.type == type, PunishmentTable.guild_id == guild_id, PunishmentTable.user_id == user_id).
-                    values(
-                        expire_date=utcnow(),
-                        handled=True
-                    )
+        await self.revoke_cases_by_types([type], guild_id, user_id, session)
+
+    async def revoke_cases_by_types(
+        self,
+        types: List[str],
+        guild_id: int, user_id: int,
+        session: Optional[AsyncSession] = None
+    ) -> None:
+        """Revokes all unhandled case entries of any of the specified types for the user ID and guild ID."""
+        async with self._join_transaction(session) as session:
+            await session.execute(
+                update(PunishmentTable).
+                filter(
+                    PunishmentTable.type.in_(types),
+                    PunishmentTable.guild_id == guild_id, PunishmentTable.user_id == user_id,
+                    PunishmentTable.handled == False
+                ).
+                values(
+                    expire_date=utcnow(),
+                    handled=True
                 )
-            await session.commit()
+            )
 
     async def fetch_moderation_statistics(self, guild_id: int, moderator_id: int) -> dict:
         """Fetches and returns a dictionary containing the general moderation statistics."""
-        bans = kicks = jails = warnings = user_total = guild_total = 0
+        guild_total = (
+            select(func.count(PunishmentTable.id).label("total")).
+            filter(
+                PunishmentTable.guild_id == guild_id,
+                PunishmentTable.visible == True
+            )
+        ).subquery()
+
+        # Left join ensures that the guild total is returned even if moderator has no cases
         async with self.session() as session: # type: ignore
             assert isinstance(session, AsyncSession)
             result: ChunkedIteratorResult = await session.execute(
-                select(PunishmentTable.type).
-                filter(
+                select(PunishmentTable.type, func.count(PunishmentTable.id), guild_total.c.total).
+                select_from(guild_total).
+                outerjoin(PunishmentTable, and_(
                     PunishmentTable.guild_id == guild_id,
                     PunishmentTable.moderator_id == moderator_id,
                     PunishmentTable.visible == True
-                )
+                )).
+                group_by(PunishmentTable.type, guild_total.c.total)
             )
 
-            # Tally moderator specific data
-            for r in result.fetchall():
-                user_total += 1
-                p_val = r[0]
-                if p_val == 'ban': bans += 1         # noqa: E701
-                if p_val == 'kick': kicks += 1       # noqa: E701
-                if p_val == 'jail': jails += 1       # noqa: E701
-                if p_val == 'warning': warnings += 1 # noqa: E701
-
-            # Get total cases of the guild
-            result = await session.execute(
-                select(func.count(PunishmentTable.type)).
-                filter(
-                    PunishmentTable.guild_id == guild_id,
-                    PunishmentTable.visible == True
-                )
-            )
-            guild_total = result.fetchone()[0]
+        counts: Dict[str, int] = {}
+        guild_total_count = 0
+        for p_type, count, total in result.fetchall():
+            guild_total_count = total
+            if p_type is not None:
+                counts[p_type] = count
 
         return {
-            "bans": bans, "kicks": kicks, "jails": jails, "warnings": warnings,
-            "user_total": user_total,
-            "guild_total": guild_total
+            "bans": counts.get("ban", 0),
+            "kicks": counts.get("kick", 0),
+            "jails": counts.get("jail", 0),
+            "warnings": counts.get("warning", 0),
+            "user_total": sum(counts.values()),
+            "guild_total": guild_total_count
         }
 
     async def is_currently_punished(self, punishment_type: str, guild_id: int, user_id: int) -> bool:
@@ -582,22 +965,19 @@ class API:
         """Returns true if user is currently muted in the guild."""
         return await self.is_currently_punished("mute", guild_id, user_id)
 
-    async def fetch_active_expiring_guild_punishments(self, guild_id: int) -> List[Case]:
-        """Returns a list of active guild punishments that can expire. Punishments
-        without an expiration date will not be included.
-        
-        Additionally, warnings, timeouts, jails and kicks are excluded from this list
-        as Pidroid doesn't have anything else to do."""
+    async def fetch_pending_expiring_punishments(self) -> List[BaseCase]:
+        """Returns a list of unhandled punishments across all guilds which have an expiration date set,
+        regardless of whether that date has already passed.
+
+        Warnings, jails and kicks are excluded from this list as Pidroid doesn't have anything
+        to do when they expire.
+
+        Users are not resolved for the returned cases."""
         async with self.session() as session: # type: ignore
             assert isinstance(session, AsyncSession)
             result: ChunkedIteratorResult = await session.execute(
                 select(PunishmentTable).
                 filter(
-                    PunishmentTable.guild_id == guild_id,
-
-                    # Expires if expiration date is past current date
-                    # and if expiration date is actually set
-                    PunishmentTable.expire_date <= utcnow(),
                     PunishmentTable.expire_date.is_not(None),
 
                     # Explicit statement to know if case was already handled
@@ -605,33 +985,40 @@ class API:
 
                     # Ignore things that cannot expire or Pidroid does not care
                     PunishmentTable.type != 'warning',
-                    PunishmentTable.type != 'timeout',
                     PunishmentTable.type != 'jail',
                     PunishmentTable.type != 'kick',
 
                     PunishmentTable.visible == True
                 )
             )
-        case_list = []
-        for r in result.fetchall():
-            c = Case(self, r[0])
-            await c._fetch_users()
-            case_list.append(c)
-        return case_list
+        return [BaseCase(self, r[0]) for r in result.fetchall()]
 
     """Translation related"""
 
-    async def insert_translation_entry(self, original_str: str, detected_lang: str, translated_str: str) -> None:
-        """Inserts a new translation entry to the database."""
+    async def insert_translation_entries(self, entries: List[Tuple[str, str, str]]) -> None:
+        """Inserts new translation entries to the database in a single statement.
+
+        Each entry is a tuple of the original string, detected language and the translated string.
+        Entries for strings which already have a translation are ignored."""
+        if len(entries) == 0:
+            return
+
         async with self.session() as session: # type: ignore
             assert isinstance(session, AsyncSession)
             async with session.begin():
-                entry = TranslationTable(
-                    original_content=original_str,
-                    detected_language=detected_lang,
-                    translated_string=translated_str
+                await session.execute(
+                    pg_insert(TranslationTable).
+                    values([
+                        dict(
+                            original_content=original_str,
+                            content_hash=translation_content_hash(original_str),
+                            detected_language=detected_lang,
+                            translated_string=translated_str
+                        )
+                        for original_str, detected_lang, translated_str in entries
+                    ]).
+                    on_conflict_do_nothing(index_elements=[TranslationTable.content_hash])
                 )
-                session.add(entry)
             await session.commit()
 
     async def fetch_translations(self, original_str: str) -> List[dict]:
@@ -640,7 +1027,10 @@ class API:
             assert isinstance(session, AsyncSession)
             result: ChunkedIteratorResult = await session.execute(
                 select(TranslationTable).
-                filter(TranslationTable.original_content == original_str)
+                filter(
+                    TranslationTable.content_hash == translation_content_hash(original_str),
+                    TranslationTable.original_content == original_str
+                )
             )
         return [{"detected_source_language": r[0].detected_language, "text": r[0].translated_string} for r in result.fetchall()]
 
@@ -732,3 +1122,73 @@ class API:
             {"query": query, "show_hidden": show_hidden}
         ))
         return [Plugin(p) for p in response["data"]]
+
+    def refresh_plugin_index(self, force: bool = False) -> None:
+        """Seeds the plugin index in the background if it was never seeded, its seed is outdated or it's forced to."""
+        seeded_at = self.plugin_index.seeded_at
+        if not force and seeded_at is not None and time.monotonic() - seeded_at < PLUGIN_INDEX_MAX_AGE:
+            return
+        if self._plugin_index_task is not None and not self._plugin_index_task.done():
+            return
+        self._plugin_index_task = self.client.loop.create_task(self._seed_plugin_index(time.monotonic()))
+
+    async def fetch_all_plugins(self) -> Tuple[List[NewPlugin], bool]:
+        """Pages through every approved plugin by approval time.
+
+        Returns the latest revisions of the plugins and whether every page was fetched."""
+        plugins: Dict[int, NewPlugin] = {}
+        seen_revisions: Set[int] = set()
+        cursor = 0
+        for _ in range(PLUGIN_INDEX_MAX_PAGES):
+            # The route may limit the amount of plugins returned, pages end once they have nothing new
+            page = [p for p in await self.fetch_new_plugins(cursor) if p.revision_id not in seen_revisions]
+            if len(page) == 0:
+                return list(plugins.values()), True
+
+            for plugin in page:
+                seen_revisions.add(plugin.revision_id)
+                known = plugins.get(plugin.id)
+                if known is None or known.time <= plugin.time:
+                    plugins[plugin.id] = plugin
+            cursor = max(cursor, max(p.time for p in page))
+        return list(plugins.values()), False
+
+    async def _seed_plugin_index(self, started_at: float) -> None:
+        try:
+            plugins, complete = await self.fetch_all_plugins()
+        except Exception:
+            return self.client.logger.exception("An exception was encountered while trying to seed the plugin index")
+        if not complete:
+            self.client.logger.warning("Plugin index could not be seeded with every plugin, searches without hits will query TheoTown API")
+        index = await self.client.loop.run_in_executor(None, PluginIndex.build, plugins, complete)
+        # Plugins published while the index was being seeded would otherwise be lost
+        index.merge_updates(self.plugin_index, started_at)
+        self.plugin_index = index
+        self.client.logger.info(f"Plugin index seeded with {len(self.plugin_index):,} plugins")
+
+    async def find_plugins(self, query: str) -> List[Plugin]:
+        """Returns plugins matching the query from the plugin index, querying the TheoTown API when the index could be missing them."""
+        self.refresh_plugin_index()
+        if self.plugin_index.is_complete:
+            plugins = self.plugin_index.search(query)
+            if plugins:
+                return plugins
+
+        plugins = await self.search_plugins(query)
+        self.plugin_index.update(plugins)
+        return plugins
+
+    async def find_plugin_by_id(self, plugin_id: int) -> List[Plugin]:
+        """Returns a plugin of the specified ID from the plugin index, querying the TheoTown API on a miss."""
+        plugin = self.plugin_index.get(plugin_id)
+        if plugin is not None:
+            return [plugin]
+
+        plugins = await self.fetch_plugin_by_id(plugin_id)
+        if plugins and self.plugin_index.is_complete:
+            # The plugin was approved after the seed, others approved along with it are picked up by reseeding
+            self.client.logger.info(f"Plugin #{plugin_id} was missing from the plugin index, reseeding it")
+            self.refresh_plugin_index(force=True)
+        # Updated after the reseed has started, so that the plugin is merged into the new index
+        self.plugin_index.update(plugins)
+        return plugins
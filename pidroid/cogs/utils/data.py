@@ -1,35 +1,172 @@
+from __future__ import annotations
+
+import asyncio
 import json
 import os
+import sys
 
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from pidroid.constants import DATA_FILE_PATH
 
 PERSISTENT_DATA_FILE = os.path.join(DATA_FILE_PATH, 'data.json')
+PERSISTENT_DATA_JOURNAL_FILE = os.path.join(DATA_FILE_PATH, 'data.journal')
+
+# Time in seconds for which writes are delayed, so that bursts of updates are written at once
+SAVE_DELAY = 1.0
+# Amount of journal entries after which the journal is compacted into the data file
+JOURNAL_COMPACTION_THRESHOLD = 1000
+
+def fsync_directory(path: str) -> None:
+    """Durably records the creation or replacement of the file in its directory."""
+    # Directories cannot be opened on Windows, which records such changes on its own
+    if sys.platform == "win32":
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def write_file(path: str, content: str, append: bool = False) -> None:
+    """Durably writes the content to a file, replacing the file atomically unless appending to it.
+
+    Appended content always starts on a new line."""
+    if append:
+        created = not os.path.exists(path)
+        if not created and os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    content = "\n" + content
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        if created:
+            fsync_directory(path)
+        return
+
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(f"{path}.tmp", path)
+    fsync_directory(path)
 
 class PersistentDataManager:
-    """This class manages Pidroid's persistent data."""
+    """This class manages Pidroid's persistent data.
+
+    Writes are done in a thread after a short delay. In journal mode, updates made with the update method
+    are appended to a journal file instead of rewriting the whole data file."""
 
-    def __init__(self) -> None:
+    def __init__(self, journal: bool = False) -> None:
         self._data: Optional[Dict] = None
+        self.journal = journal
+
+        self._journal_length = 0
+        self._pending_entries: Dict[str, Any] = {}
+        self._snapshot_requested = False
+        self._flush_task: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
 
     @property
     def data(self) -> dict:
         """Returns a mutable dictionary of persistent data."""
         if self._data is None:
-            self.load()
-        return self._data or {}
-
-    def load(self) -> None:
-        """Loads persistent data from a file. Returns a plain dictionary if data file doesn't exist."""
-        if not os.path.exists(PERSISTENT_DATA_FILE):
-            self._data = {}
-        else:
+            self._data, self._journal_length = self._read()
+        return self._data
+
+    async def load(self) -> None:
+        """Loads persistent data from the data file and the journal in a thread."""
+        self._data, self._journal_length = await asyncio.get_running_loop().run_in_executor(None, self._read)
+
+    def _read(self) -> Tuple[dict, int]:
+        data: dict = {}
+        if os.path.exists(PERSISTENT_DATA_FILE):
             with open(PERSISTENT_DATA_FILE, encoding="utf-8") as f:
-                self._data = json.load(f)
+                data = json.load(f)
+
+        journal_length = 0
+        if os.path.exists(PERSISTENT_DATA_JOURNAL_FILE):
+            valid_length = 0
+            with open(PERSISTENT_DATA_JOURNAL_FILE, "rb") as f:
+                for line in f:
+                    # The last entry is incomplete if the process was killed while writing it
+                    if not line.endswith(b"\n"):
+                        break
+                    valid_length += len(line)
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    data[entry["key"]] = entry["value"]
+                    journal_length += 1
+
+            # The incomplete entry is cut off, so that it's not continued by the next entry
+            if valid_length < os.path.getsize(PERSISTENT_DATA_JOURNAL_FILE):
+                with open(PERSISTENT_DATA_JOURNAL_FILE, "r+b") as f:
+                    f.truncate(valid_length)
+                    os.fsync(f.fileno())
+        return data, journal_length
 
     def save(self) -> None:
-        """Saves persistent data to a file."""
-        with open(f"{PERSISTENT_DATA_FILE}.tmp", "w", encoding="utf-8") as f:
-            json.dump(self._data, f)
-        os.rename(f"{PERSISTENT_DATA_FILE}.tmp", PERSISTENT_DATA_FILE)
+        """Schedules the whole persistent data dictionary to be written to the data file."""
+        self._snapshot_requested = True
+        self._schedule_flush()
+
+    def update(self, values: dict) -> None:
+        """Updates the specified persistent data keys and schedules them to be written."""
+        self.data.update(values)
+        if not self.journal:
+            return self.save()
+        self._pending_entries.update(values)
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(SAVE_DELAY)
+        # Writes are not cancelled midway, as the task is only cancelled while it's still waiting
+        self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Writes all pending changes in a thread."""
+        async with self._write_lock:
+            loop = asyncio.get_running_loop()
+            if self._snapshot_requested or self._journal_length + len(self._pending_entries) > JOURNAL_COMPACTION_THRESHOLD:
+                # Pending journal entries are a part of the snapshot, which is serialized before
+                # the data can change again, leaving only the write to the thread
+                snapshot = json.dumps(self.data)
+                self._snapshot_requested = False
+                self._pending_entries = {}
+                await loop.run_in_executor(None, self._write_snapshot, snapshot)
+                self._journal_length = 0
+                return
+
+            if not self._pending_entries:
+                return
+            entries = self._pending_entries
+            self._pending_entries = {}
+            content = "".join(json.dumps({"key": key, "value": value}) + "\n" for key, value in entries.items())
+            await loop.run_in_executor(None, self._append_journal, content)
+            self._journal_length += len(entries)
+
+    def _write_snapshot(self, snapshot: str) -> None:
+        write_file(PERSISTENT_DATA_FILE, snapshot)
+        # The journal is only truncated once its entries are safely in the data file
+        if os.path.exists(PERSISTENT_DATA_JOURNAL_FILE):
+            write_file(PERSISTENT_DATA_JOURNAL_FILE, "")
+
+    def _append_journal(self, content: str) -> None:
+        write_file(PERSISTENT_DATA_JOURNAL_FILE, content, append=True)
+
+    async def close(self) -> None:
+        """Cancels the scheduled write and writes all pending changes immediately."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
@@ -1,7 +1,22 @@
+from __future__ import annotations
+
+import asyncio
 import os
+import time
+
+from discord.file import File
+from discord.message import Message
+from io import BytesIO
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from pidroid.constants import RESOURCE_FILE_PATH
 
+# Maximum amount of bytes of resource files kept in memory
+RESOURCE_CACHE_BUDGET = 16 * 1024 * 1024
+# Time in seconds for which an uploaded resource is linked to instead of being uploaded again,
+# as Discord attachment URLs stop working after a while
+RESOURCE_URL_TTL = 12 * 60 * 60
+
 class Resource(str): # All this for type hints
 
     def __new__(cls, *paths: str):
@@ -10,3 +25,70 @@ class Resource(str): # All this for type hints
 def get_resource(*paths: str) -> str:
     """Returns absolute path to a Pidroid resource file."""
     return os.path.join(RESOURCE_FILE_PATH, *paths)
+
+def read_resource(name: str) -> bytes:
+    """Returns the contents of a Pidroid resource file."""
+    with open(get_resource(name), "rb") as f:
+        return f.read()
+
+class ResourceCache:
+    """This class keeps Pidroid resource files in memory within a size budget and remembers where they were uploaded."""
+
+    def __init__(self, budget: int = RESOURCE_CACHE_BUDGET) -> None:
+        self.budget = budget
+        self.size = 0
+        self._files: Dict[str, bytes] = {}
+        self._urls: Dict[str, Tuple[str, float]] = {}
+
+    async def preload(self, *names: str) -> None:
+        """Loads the resource files into memory in a thread, skipping the ones which do not fit in the budget."""
+        missing = [n for n in names if n not in self._files]
+        loaded = await asyncio.get_running_loop().run_in_executor(None, self._read_files, missing)
+        for name, content in loaded:
+            if name not in self._files and self.size + len(content) <= self.budget:
+                self._files[name] = content
+                self.size += len(content)
+
+    def _read_files(self, names: List[str]) -> List[Tuple[str, bytes]]:
+        loaded = []
+        remaining = self.budget - self.size
+        for name in names:
+            try:
+                size = os.path.getsize(get_resource(name))
+            except OSError:
+                # Missing files are reported when they are actually used
+                continue
+            if size <= remaining:
+                loaded.append((name, read_resource(name)))
+                remaining -= size
+        return loaded
+
+    async def read(self, name: str) -> bytes:
+        """Returns the contents of the resource file, reading it in a thread if it is not in memory."""
+        content = self._files.get(name, None)
+        if content is None:
+            return await asyncio.get_running_loop().run_in_executor(None, read_resource, name)
+        return content
+
+    async def file(self, name: str) -> File:
+        """Returns a discord File of the resource file."""
+        return File(BytesIO(await self.read(name)), filename=os.path.basename(name))
+
+    def get_url(self, name: str) -> Optional[str]:
+        """Returns the URL of the previous upload of the resource file, if it can still be used."""
+        entry = self._urls.get(name, None)
+        if entry is None or time.monotonic() - entry[1] > RESOURCE_URL_TTL:
+            return None
+        return entry[0]
+
+    async def send(self, send: Callable[..., Awaitable[Message]], name: str, content: Optional[str] = None, **kwargs: Any) -> Message:
+        """Sends the resource file with the specified send method, linking to its previous upload if possible."""
+        url = self.get_url(name)
+        if url is not None:
+            return await send(url if content is None else f"{content}\n{url}", **kwargs)
+
+        message = await send(content, file=await self.file(name), **kwargs)
+        # Attachments of messages which are deleted afterwards can not be linked to
+        if message.attachments and kwargs.get("delete_after") is None:
+            self._urls[name] = (message.attachments[0].url, time.monotonic())
+        return message
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from discord.embeds import Embed
+from discord.ext.commands.core import Command # type: ignore
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, TypeVar
+
+from pidroid.cogs.models.categories import Category, UncategorizedCategory
+from pidroid.cogs.utils.embeds import PidroidEmbed
+from pidroid.cogs.utils.parsers import get_deletion_variants
+
+# Minimum length of a help query for it to be suggested names which differ by a single typo
+SUGGESTION_MIN_LENGTH = 3
+# Maximum amount of names suggested for a help query
+SUGGESTION_LIMIT = 3
+# Maximum amount of prebuilt embeds or documentation lists of each kind, as every guild can have its own prefix
+DOCUMENTATION_CACHE_SIZE = 256
+
+T = TypeVar("T")
+
+def get_full_command_name(command: Command) -> str:
+    """Returns full command name including any command groups."""
+    name = ''
+    if len(command.parents) > 0:
+        for parent in reversed(command.parents):
+            name += f'{parent.name} '
+    return name + command.name
+
+def get_command_usage(prefix: str, command: Command) -> str:
+    usage = '`' + prefix + get_full_command_name(command) + '`'
+    if command.usage is not None:
+        usage += ' `' + command.usage + '`'
+    return usage
+
+def get_command_documentation(prefix: str, c: Command) -> Tuple[str, str]:
+    usage = c.usage or ""
+    name = prefix + get_full_command_name(c) + " " + usage
+    value = c.brief or 'Not documented.'
+
+    # Fetch command aliases
+    aliases = c.aliases
+    if len(aliases) > 0:
+        value += '\n'
+        value += '**Aliases:** `' + '`, `'.join(aliases) + '`.'
+    return name, value
+
+def get_command_category(command: Command) -> type:
+    """Returns the category class the command was declared with."""
+    orig_kwargs: dict = command.__original_kwargs__
+    return orig_kwargs.get("category", UncategorizedCategory)
+
+class CommandIndex:
+    """This class implements an index of bot commands and categories for the help command.
+
+    A new index is built whenever extensions are loaded, documentation is built once per prefix."""
+
+    def __init__(self, commands: Iterable[Command], categories: List[Category]) -> None:
+        self.categories = categories
+        self._commands: Dict[str, Command] = {}
+        self._categories: Dict[str, Category] = {}
+        self._category_commands: Dict[str, List[Command]] = {}
+        # Maps deletion variants of command and category names to the names
+        self._variants: Dict[str, Set[str]] = {}
+
+        self._index_embeds: OrderedDict[Tuple[str, str], Embed] = OrderedDict()
+        self._command_embeds: OrderedDict[Tuple[str, str], Embed] = OrderedDict()
+        self._category_documentation: OrderedDict[Tuple[str, str], List[Tuple[str, str]]] = OrderedDict()
+
+        for category in categories:
+            self._categories[category.title.lower()] = category
+            self._category_commands[category.title.lower()] = []
+
+        for command in commands:
+            if command.hidden:
+                continue
+
+            parent_name = get_full_command_name(command.parent) + ' ' if command.parent is not None else ''
+            for name in [command.name, *command.aliases]:
+                self._commands.setdefault(f'{parent_name}{name}'.lower(), command)
+
+            if get_full_command_name(command).startswith("jishaku"):
+                continue
+
+            command_category = get_command_category(command)
+            for category in categories:
+                if isinstance(category, command_category):
+                    self._category_commands[category.title.lower()].append(command)
+
+        for name in [*self._commands, *self._categories]:
+            for variant in get_deletion_variants(name):
+                self._variants.setdefault(variant, set()).add(name)
+
+    def get_command(self, name: str) -> Optional[Command]:
+        """Returns a visible command by its full name or alias."""
+        return self._commands.get(name.lower())
+
+    def get_category(self, name: str) -> Optional[Category]:
+        """Returns a category by its title."""
+        return self._categories.get(name.lower())
+
+    def get_category_commands(self, category: Category) -> List[Command]:
+        """Returns a list of all visible commands belonging to the specified category."""
+        return self._category_commands.get(category.title.lower(), [])
+
+    def suggest(self, query: str) -> List[str]:
+        """Returns a list of command and category names which differ from the query by a single typo."""
+        query = query.lower()
+        if len(query) < SUGGESTION_MIN_LENGTH:
+            return []
+
+        names: Set[str] = set()
+        for variant in get_deletion_variants(query):
+            names.update(self._variants.get(variant, ()))
+        names.discard(query)
+        return sorted(names, key=lambda n: (-SequenceMatcher(None, query, n).ratio(), n))[:SUGGESTION_LIMIT]
+
+    def _get_or_build(self, cache: OrderedDict[Tuple[str, str], T], key: Tuple[str, str], build: Callable[[], T]) -> T:
+        """Returns the cached value, building it and evicting the least recently used value if it's not cached."""
+        value = cache.get(key)
+        if value is None:
+            value = cache[key] = build()
+            if len(cache) > DOCUMENTATION_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return value
+
+    def get_index_embed(self, prefix: str, bot_name: str) -> Embed:
+        """Returns an embed listing all command categories."""
+        def build() -> Embed:
+            embed = PidroidEmbed(
+                title=f'{bot_name} command category index',
+                description=f'This is a list of all bot commands and their categories. Use `{prefix}help [category/command]` to find out more about them!\n\n**Select a category:**'
+            )
+            for category in self.categories:
+                embed.add_field(name=f"**{category.emote} {category.title}**", value=category.description, inline=False)
+            return embed
+        return self._get_or_build(self._index_embeds, (prefix, bot_name), build)
+
+    def get_command_embed(self, prefix: str, command: Command) -> Embed:
+        """Returns an embed describing the command."""
+        def build() -> Embed:
+            embed = PidroidEmbed(
+                title=f"{get_full_command_name(command)}",
+                description=command.brief or "No description."
+            )
+
+            embed.add_field(name="Usage", value=get_command_usage(prefix, command), inline=False)
+
+            if len(command.aliases) > 0:
+                embed.add_field(name="Aliases", value=', '.join(command.aliases))
+
+            permissions = command.__original_kwargs__.get("permissions", [])
+            if len(permissions) > 0:
+                embed.add_field(name="Permissions", value=', '.join(permissions))
+            return embed
+        return self._get_or_build(self._command_embeds, (prefix, get_full_command_name(command)), build)
+
+    def get_category_documentation(self, prefix: str, category: Category) -> List[Tuple[str, str]]:
+        """Returns a list of names and descriptions of all visible commands belonging to the category."""
+        return self._get_or_build(
+            self._category_documentation, (prefix, category.title.lower()),
+            lambda: [get_command_documentation(prefix, c) for c in self.get_category_commands(category)]
+        )
@@ -1,25 +1,375 @@
 from __future__ import annotations
 
+import asyncio
+import random
 import re
+import time
 
+from aiohttp import ClientError, ClientSession, TCPConnector, TraceConfig
 from aiohttp.client import ClientTimeout
-from urllib.parse import urlencode
-from typing import Optional, Union, TYPE_CHECKING
+from collections import OrderedDict
+from urllib.parse import urlencode, urlsplit
+from typing import Any, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
 
-from pidroid.cogs.models.exceptions import APIException
+from pidroid.cogs.models.exceptions import APIException, APIUnavailable, ResponseTooLarge
 
 if TYPE_CHECKING:
     from pidroid.client import Pidroid
 
 DEFAULT_HEADERS = {'User-Agent': 'Pidroid bot by JustAnyone'}
 
+# Maximum amount of simultaneous outbound connections in total and to a single host,
+# so that a slow host cannot take up all of the connections
+CONNECTION_LIMIT = 100
+CONNECTION_LIMIT_PER_HOST = 10
+# Time in seconds for which idle connections are kept open for reuse
+KEEPALIVE_TIMEOUT = 30
+# Time in seconds for which resolved host addresses are cached
+DNS_CACHE_TTL = 300
+# Default timeout of outbound requests and the stricter timeout of TheoTown API requests
+DEFAULT_TIMEOUT = ClientTimeout(total=30, connect=10)
+THEOTOWN_API_TIMEOUT = ClientTimeout(total=15, connect=5)
+
+# Read-only TheoTown API routes whose responses are cached, mapped to the amount of seconds
+# a response stays fresh and the amount of seconds it may be served stale while it is refreshed
+ROUTE_CACHE_POLICIES: Dict[str, Tuple[float, float]] = {
+    "/private/game/get_online_statistics": (30, 120),
+    "/public/game/gallery": (300, 900),
+    "/private/plugin/find2": (300, 900),
+    "/private/game/lookup_version": (3600, 86400),
+    "/private/forum/find_account": (120, 600)
+}
+
+# Read-only TheoTown API routes which can be safely retried and shared between concurrent requests
+IDEMPOTENT_ROUTES = set(ROUTE_CACHE_POLICIES) | {
+    "/private/game/fetch_user",
+    "/private/plugin/get_new"
+}
+
+# Maximum amount of TheoTown API responses kept in the response cache
+RESPONSE_CACHE_SIZE = 512
+
+# Maximum amount of attempts for requests to idempotent routes
+MAX_REQUEST_ATTEMPTS = 3
+# Base and maximum delay in seconds between retries, the delay doubles with every attempt
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 5.0
+# Status codes of responses to idempotent routes which are retried
+RETRYABLE_STATUS_CODES = {500, 502, 503, 504}
+
+# Amount of consecutive failures after which requests to a host are no longer sent
+CIRCUIT_FAILURE_THRESHOLD = 5
+# Time in seconds after which a single trial request is sent to a failing host
+CIRCUIT_RESET_TIMEOUT = 30.0
+
+# Size of chunks in which size limited downloads are streamed
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+class HostStatistics:
+    """This class keeps track of outbound request latency and errors of a single host."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record(self, latency: float, error: bool) -> None:
+        """Records a completed request."""
+        self.requests += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        if error:
+            self.errors += 1
+
+    @property
+    def average_latency(self) -> float:
+        """Returns the average request latency in seconds."""
+        if self.requests == 0:
+            return 0.0
+        return self.total_latency / self.requests
+
+    @property
+    def error_rate(self) -> float:
+        """Returns the ratio of requests which failed or received a server error response."""
+        if self.requests == 0:
+            return 0.0
+        return self.errors / self.requests
+
+class OutboundStatistics:
+    """This class keeps track of outbound request statistics of every host."""
+
+    def __init__(self) -> None:
+        self.hosts: Dict[str, HostStatistics] = {}
+
+    def record(self, host: str, latency: float, error: bool) -> None:
+        """Records a completed request to the specified host."""
+        statistics = self.hosts.get(host, None)
+        if statistics is None:
+            statistics = self.hosts[host] = HostStatistics()
+        statistics.record(latency, error)
+
+    def create_trace_config(self) -> TraceConfig:
+        """Returns a trace config which records statistics of requests sent by a client session."""
+
+        async def on_request_start(session: ClientSession, context: Any, params: Any) -> None:
+            context.start = time.perf_counter()
+
+        async def on_request_end(session: ClientSession, context: Any, params: Any) -> None:
+            self.record(params.url.host, time.perf_counter() - context.start, params.response.status >= 500)
+
+        async def on_request_exception(session: ClientSession, context: Any, params: Any) -> None:
+            self.record(params.url.host, time.perf_counter() - context.start, True)
+
+        trace_config = TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+        return trace_config
+
+def create_client_session(statistics: OutboundStatistics) -> ClientSession:
+    """Returns the client session used for all outbound requests, with tuned connection pooling."""
+    connector = TCPConnector(
+        limit=CONNECTION_LIMIT, limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT, ttl_dns_cache=DNS_CACHE_TTL
+    )
+    return ClientSession(
+        connector=connector, timeout=DEFAULT_TIMEOUT,
+        trace_configs=[statistics.create_trace_config()]
+    )
+
+class CachedResponse:
+    """This class represents a cached TheoTown API response."""
+
+    def __init__(self, data: Any, ttl: float, stale_ttl: float) -> None:
+        self.data = data
+        self.fresh_until = time.monotonic() + ttl
+        self.stale_until = self.fresh_until + stale_ttl
+
+    @property
+    def is_fresh(self) -> bool:
+        """Returns true if the response can be served without refreshing it."""
+        return time.monotonic() < self.fresh_until
+
+    @property
+    def is_usable(self) -> bool:
+        """Returns true if the response can still be served, either fresh or stale."""
+        return time.monotonic() < self.stale_until
+
+class ResponseCache:
+    """This class implements a size bounded LRU cache of TheoTown API responses keyed by route."""
+
+    def __init__(self, max_size: int = RESPONSE_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[Route, CachedResponse] = OrderedDict()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, route: Route) -> Optional[CachedResponse]:
+        """Returns the cached response for the route, if it can still be served."""
+        entry = self._entries.get(route, None)
+        if entry is None or not entry.is_usable:
+            self._entries.pop(route, None)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(route)
+        if entry.is_fresh:
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return entry
+
+    def store(self, route: Route, data: Any, ttl: float, stale_ttl: float) -> None:
+        """Stores a response for the route, evicting the least recently used responses if the cache is full."""
+        self._entries[route] = CachedResponse(data, ttl, stale_ttl)
+        self._entries.move_to_end(route)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Removes cached responses of the specified route path, or all of them if no path is specified."""
+        if path is None:
+            return self._entries.clear()
+        for route in [r for r in self._entries if r.path == path]:
+            del self._entries[route]
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        """Returns the ratio of lookups served from the cache, if there were any lookups."""
+        lookups = self.hits + self.stale_hits + self.misses
+        if lookups == 0:
+            return None
+        return (self.hits + self.stale_hits) / lookups
+
+class CircuitBreaker:
+    """This class implements a circuit breaker which stops requests to a host after consecutive failures."""
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, reset_timeout: float = CIRCUIT_RESET_TIMEOUT) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        # Token of the trial request sent while the circuit is half-open
+        self._trial: Optional[object] = None
+        self._regular = object()
+
+    @property
+    def state(self) -> str:
+        """Returns the state of the circuit breaker: closed, open or half-open."""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def allow_request(self) -> Optional[object]:
+        """Returns a token to record the outcome of the request with if it can be sent, None otherwise.
+
+        A single trial request is let through once the reset timeout passes."""
+        state = self.state
+        if state == "closed":
+            return self._regular
+        if state == "open" or self._trial is not None:
+            return None
+        self._trial = object()
+        return self._trial
+
+    def record(self, token: object, success: Optional[bool]) -> None:
+        """Records the outcome of a request, None meaning that the request was cancelled before it completed."""
+        # Requests sent before the circuit opened may complete while the trial request is still in progress
+        if token is self._trial:
+            self._trial = None
+        if success is None:
+            return
+
+        if success:
+            self.failures = 0
+            self.opened_at = None
+            return
+
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
 class HTTP:
     """This class implements a basic TheoTown API HTTP request handling system."""
 
     def __init__(self, client: Pidroid) -> None:
         self.client = client
+        self.cache = ResponseCache()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._in_flight: Dict[Route, asyncio.Task] = {}
+        self._revalidating: Dict[Route, asyncio.Task] = {}
 
     async def request(self, method: str, route: Route, headers: Optional[dict] = None, data: Optional[dict] = None):
+        """Sends a request to the TheoTown API, serving responses of cacheable routes from the cache."""
+        if method != "GET" or headers is not None or data is not None or not route.idempotent:
+            return await self._send(method, route, headers, data)
+
+        policy = route.cache_policy
+        if policy is not None:
+            # Cached responses are shared between callers, so they must not be modified
+            entry = self.cache.get(route)
+            if entry is not None:
+                if not entry.is_fresh:
+                    self._revalidate(route)
+                return entry.data
+
+        return await self._fetch(route)
+
+    def get_circuit_breaker(self, host: str) -> CircuitBreaker:
+        """Returns the circuit breaker of the specified host."""
+        breaker = self._breakers.get(host, None)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker()
+        return breaker
+
+    def _revalidate(self, route: Route) -> None:
+        """Refreshes a stale cached response in the background, unless it is already being refreshed."""
+        if route in self._revalidating:
+            return
+        task = self.client.loop.create_task(self._refresh(route))
+        self._revalidating[route] = task
+        task.add_done_callback(lambda _: self._revalidating.pop(route, None))
+
+    async def _refresh(self, route: Route) -> None:
+        try:
+            await self._fetch(route)
+        except (APIException, ClientError, asyncio.TimeoutError) as e:
+            # The stale response keeps being served until it expires
+            self.client.logger.warning(f"Failed to refresh cached response of {route}: {e}")
+
+    async def _fetch(self, route: Route):
+        """Sends a GET request to an idempotent route, sharing it with concurrent requests to the same route."""
+        task = self._in_flight.get(route, None)
+        if task is None:
+            task = self.client.loop.create_task(self._fetch_with_retries(route))
+            self._in_flight[route] = task
+            task.add_done_callback(lambda t: self._on_fetch_done(route, t))
+        # Shielded, so that a cancelled caller does not cancel the request for everyone else
+        return await asyncio.shield(task)
+
+    def _on_fetch_done(self, route: Route, task: asyncio.Task) -> None:
+        self._in_flight.pop(route, None)
+        # Marks the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def _fetch_with_retries(self, route: Route):
+        """Sends a GET request, retrying failures with jittered exponential backoff, and caches successful responses."""
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = await self._send("GET", route)
+                break
+            except APIUnavailable:
+                raise
+            except APIException as e:
+                if e.status not in RETRYABLE_STATUS_CODES or attempt >= MAX_REQUEST_ATTEMPTS:
+                    raise
+            except (ClientError, asyncio.TimeoutError):
+                if attempt >= MAX_REQUEST_ATTEMPTS:
+                    raise
+            delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+            await asyncio.sleep(random.uniform(0, delay)) # nosec
+
+        policy = route.cache_policy
+        # Failed responses are not cached, so that a previously cached response keeps being served
+        if policy is not None and isinstance(response, dict) and response.get("success"):
+            self.cache.store(route, response, *policy)
+        return response
+
+    async def _send(self, method: str, route: Route, headers: Optional[dict] = None, data: Optional[dict] = None):
+        """Sends a single request, failing fast if the route host is failing."""
+        breaker = self.get_circuit_breaker(route.host)
+        token = breaker.allow_request()
+        if token is None:
+            raise APIUnavailable()
+
+        success: Optional[bool] = None
+        try:
+            response = await self._request(method, route, headers, data)
+            success = True
+            return response
+        except APIException as e:
+            # Client errors mean that the host is responding
+            success = e.status < 500 or e.status == 501
+            raise
+        except (ClientError, asyncio.TimeoutError):
+            success = False
+            raise
+        finally:
+            breaker.record(token, success)
+
+    async def _request(self, method: str, route: Route, headers: Optional[dict] = None, data: Optional[dict] = None):
         # Deal with headers
         new_headers = DEFAULT_HEADERS.copy()
         if headers:
@@ -31,7 +381,8 @@ class HTTP:
         assert self.client.session is not None
         async with self.client.session.request(
             method, route.url,
-            headers=new_headers, data=data
+            headers=new_headers, data=data,
+            timeout=THEOTOWN_API_TIMEOUT
         ) as r:
             # Handle errors
             if r.status == 501:
@@ -71,6 +422,32 @@ class Route:
     def __str__(self) -> str:
         return self.url
 
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Route) and self.url == other.url
+
+    def __hash__(self) -> int:
+        return hash(self.url)
+
+    @classmethod
+    def host_name(cls) -> str:
+        """Returns the host name of TheoTown API."""
+        return urlsplit(cls.BASE_URL).netloc
+
+    @property
+    def host(self) -> str:
+        """Returns the host name of the route."""
+        return self.host_name()
+
+    @property
+    def idempotent(self) -> bool:
+        """Returns true if the route is read-only, meaning that it can be retried and shared between requests."""
+        return self.path in IDEMPOTENT_ROUTES
+
+    @property
+    def cache_policy(self) -> Optional[Tuple[float, float]]:
+        """Returns the fresh and stale time to live of the route responses, if they are cacheable."""
+        return ROUTE_CACHE_POLICIES.get(self.path, None)
+
     @property
     def query(self) -> Optional[str]:
         """Returns route query dictionary as string."""
@@ -95,7 +472,24 @@ async def get(client: Pidroid, url: str, headers: Optional[dict] = None, cookies
     assert client.session is not None
     return client.session.get(url, headers=headers, cookies=cookies, timeout=ClientTimeout(timeout))
 
-async def post(client: Pidroid, url: str, data: Union[dict, str], headers: Optional[dict] = None, cookies: Optional[dict] = None, timeout: int = 30):
+async def read_limited(client: Pidroid, url: str, max_size: int, timeout: int = 30) -> bytes:
+    """Downloads the file at the specified URL, aborting as soon as it exceeds the maximum size."""
+    async with await get(client, url, timeout=timeout) as r:
+        r.raise_for_status()
+        if r.content_length is not None and r.content_length > max_size:
+            raise ResponseTooLarge(max_size)
+
+        chunks: List[bytes] = []
+        size = 0
+        async for chunk in r.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            # Content length can be missing or wrong, so the cap is enforced on the received bytes too
+            if size > max_size:
+                raise ResponseTooLarge(max_size)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+async def post(client: Pidroid, url: str, data: Union[dict, str, List[Tuple[str, str]]], headers: Optional[dict] = None, cookies: Optional[dict] = None, timeout: int = 30):
     """Sends a POST request to the specified URL."""
     assert client.session is not None
     return client.session.post(url, data=data, headers=headers, cookies=cookies, timeout=ClientTimeout(timeout))
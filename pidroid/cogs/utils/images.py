@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+
+from discord.ext.commands.errors import BadArgument # type: ignore
+from io import BytesIO
+from multiprocessing.connection import Connection
+from PIL import Image # type: ignore
+from PIL import ImageDraw, ImageFont, UnidentifiedImageError
+from typing import Any, Callable, Optional, Set, Tuple
+
+from pidroid.cogs.utils.file import get_resource
+
+# Amount of worker processes which render images
+IMAGE_WORKER_COUNT = 2
+# Maximum amount of image jobs which are either rendering or waiting for a worker
+MAX_QUEUED_IMAGE_JOBS = 8
+# Time in seconds after which a command stops waiting for its image job
+IMAGE_JOB_TIMEOUT = 20
+# Maximum amount of pixels in an input image
+MAX_IMAGE_PIXELS = 40_000_000
+# Size of the image produced by memefy command
+MEMEFY_WIDTH = 128
+# Downscaling first reduces the image by an integer factor while it's at least this many times larger than the target,
+# which is much cheaper than resampling the whole image and is indistinguishable at this ratio
+RESAMPLING_REDUCING_GAP = 3.0
+
+# Bonk template and font, loaded once per worker process
+_bonk_resources: Optional[Tuple[Image.Image, ImageFont.FreeTypeFont]] = None
+
+class ImageTooLarge(Exception):
+    """Raised inside a worker process when an input image has too many pixels."""
+    pass
+
+def open_image(data: bytes) -> Image.Image:
+    """Opens an image from bytes, without decoding it, after assuring that it is not too large."""
+    img = Image.open(BytesIO(data))
+    if img.width * img.height > MAX_IMAGE_PIXELS:
+        raise ImageTooLarge()
+    return img
+
+def draft_image(img: Image.Image, size: Tuple[int, int]) -> None:
+    """Configures JPEG images to be decoded at the smallest scale which is not below the specified size."""
+    if img.format == "JPEG":
+        # Decoding at 1/2, 1/4 or 1/8 scale skips most of the work and memory of a full decode
+        img.draft(img.mode, size)
+
+def encode_image(img: Image.Image, format: str, **params: Any) -> bytes:
+    """Encodes and closes the image."""
+    output = BytesIO()
+    img.save(output, format=format, **params)
+    img.close()
+    return output.getvalue()
+
+def draw_text_with_border(draw, x, y, text, font, text_colour='white', border_colour='black') -> None:
+    """Draws text with borders."""
+    # Borders
+    draw.text((x - 1, y - 1), text, font=font, fill=border_colour)
+    draw.text((x + 1, y - 1), text, font=font, fill=border_colour)
+    draw.text((x - 1, y + 1), text, font=font, fill=border_colour)
+    draw.text((x + 1, y + 1), text, font=font, fill=border_colour)
+    # The actual text
+    draw.text((x, y), text, font=font, fill=text_colour)
+
+def get_bonk_resources() -> Tuple[Image.Image, ImageFont.FreeTypeFont]:
+    """Returns the decoded bonk template and the parsed font, loading them only once per process."""
+    global _bonk_resources
+    if _bonk_resources is None:
+        template = Image.open(get_resource('bonk.jpg'))
+        template.load()
+        _bonk_resources = (template, ImageFont.truetype(get_resource('COMIC.TTF'), 14))
+    return _bonk_resources
+
+def render_bonk(target_name: str, issuer_name: str) -> bytes:
+    """Renders the bonk image with the target and issuer names."""
+    template, font = get_bonk_resources()
+    img = template.copy()
+    draw = ImageDraw.Draw(img)
+    # Target
+    draw_text_with_border(draw, 165, 140, target_name, font)
+    # Issuer of command
+    draw_text_with_border(draw, 7, 43, issuer_name, font)
+    return encode_image(img, 'png')
+
+def render_memefy(data: bytes, retain_aspect: bool) -> bytes:
+    """Renders a 128 pixel wide version of the image."""
+    img = open_image(data)
+    sizes = (MEMEFY_WIDTH, MEMEFY_WIDTH)
+    if retain_aspect:
+        orig_w, orig_h = img.size
+        sizes = (MEMEFY_WIDTH, max(1, round(orig_h * MEMEFY_WIDTH / orig_w)))
+    draft_image(img, sizes)
+    resized = img.resize(sizes, Image.LANCZOS, reducing_gap=RESAMPLING_REDUCING_GAP)
+    img.close()
+    return encode_image(resized, 'png')
+
+def render_hank(data: bytes, quality: int) -> bytes:
+    """Renders the image as a JPEG of the specified quality."""
+    img = open_image(data)
+    converted = img.convert("RGB")
+    img.close()
+    return encode_image(converted, 'JPEG', quality=quality)
+
+def run_worker_process(connection: Connection) -> None:
+    """Runs image jobs received through the connection until it's closed."""
+    while True:
+        try:
+            function, args = connection.recv()
+        except EOFError:
+            return
+        try:
+            result: Tuple[bool, Any] = (True, function(*args))
+        except Exception as e:
+            result = (False, e)
+        connection.send(result)
+
+class WorkerProcess:
+    """This class represents a process which renders one image job at a time."""
+
+    def __init__(self) -> None:
+        # Forking a process with a running event loop and open connections is unsafe
+        context = multiprocessing.get_context("spawn")
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=run_worker_process, args=(child_connection,), daemon=True)
+        self.process.start()
+        child_connection.close()
+
+    def run(self, function: Callable[..., bytes], args: tuple) -> bytes:
+        """Runs the job in the process and returns its result, blocking until the process is done with it.
+
+        EOFError is raised if the process dies while running the job."""
+        try:
+            self.connection.send((function, args))
+            success, result = self.connection.recv()
+        except (EOFError, OSError):
+            self.connection.close()
+            raise EOFError("Image worker process died while running a job")
+        if not success:
+            raise result
+        return result
+
+    def kill(self) -> None:
+        """Stops the process, along with the job it's running."""
+        self.process.kill()
+        self.process.join()
+
+class ImageWorker:
+    """This class implements a bounded pool of processes which render images outside of the event loop."""
+
+    def __init__(self, max_workers: int = IMAGE_WORKER_COUNT, max_queued_jobs: int = MAX_QUEUED_IMAGE_JOBS) -> None:
+        self.max_workers = max_workers
+        self.max_queued_jobs = max_queued_jobs
+        self.queued_jobs = 0
+        self._workers: Set[WorkerProcess] = set()
+        self._idle_workers: Optional[asyncio.Queue[WorkerProcess]] = None
+
+    async def render(self, function: Callable[..., bytes], *args: Any, timeout: float = IMAGE_JOB_TIMEOUT) -> bytes:
+        """Renders an image in a worker process and returns the encoded image bytes."""
+        if self.queued_jobs >= self.max_queued_jobs:
+            raise BadArgument("Too many images are being processed right now, please try again later!")
+
+        self.queued_jobs += 1
+        try:
+            return await asyncio.wait_for(self._run(function, args), timeout)
+        except asyncio.TimeoutError:
+            raise BadArgument("Processing your image took too long!")
+        except ImageTooLarge:
+            raise BadArgument(f"Your image is too large! Please upload images below {MAX_IMAGE_PIXELS // 1_000_000} megapixels")
+        except (UnidentifiedImageError, Image.DecompressionBombError, EOFError):
+            raise BadArgument("I could not process your image!")
+        finally:
+            self.queued_jobs -= 1
+
+    async def _run(self, function: Callable[..., bytes], args: tuple) -> bytes:
+        worker = await self._acquire_worker()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, worker.run, function, args)
+        except (asyncio.CancelledError, EOFError):
+            # The job timed out or its process died, for example by running out of memory,
+            # only that process is stopped and replaced, so that jobs of other processes are unaffected
+            self._workers.discard(worker)
+            worker.kill()
+            worker = self._start_worker()
+            raise
+        finally:
+            assert self._idle_workers is not None
+            self._idle_workers.put_nowait(worker)
+
+    async def _acquire_worker(self) -> WorkerProcess:
+        if self._idle_workers is None:
+            self._idle_workers = asyncio.Queue()
+        # Processes are started on demand, as most image commands are rarely used
+        if self._idle_workers.empty() and len(self._workers) < self.max_workers:
+            return self._start_worker()
+        return await self._idle_workers.get()
+
+    def _start_worker(self) -> WorkerProcess:
+        worker = WorkerProcess()
+        self._workers.add(worker)
+        return worker
+
+    def close(self) -> None:
+        """Stops the worker processes without waiting for the queued jobs."""
+        for worker in self._workers:
+            worker.kill()
+        self._workers.clear()
@@ -1,5 +1,7 @@
 import re
 
+from typing import List, Set
+
 # Compile patters upon load for performance
 INLINE_TRANSLATION_PATTERN = re.compile(r'\[.*].*', flags=re.DOTALL)
 
@@ -28,6 +30,16 @@ def truncate_string(string: str, max_length: int = 2048, replace_value: str = '.
         return string[:max_length - len(replace_value)] + replace_value
     return string
 
+def tokenize(text: str) -> List[str]:
+    """Returns a list of lowercase words in the text."""
+    return re.findall(r"\w+", text.lower())
+
+def get_deletion_variants(token: str) -> Set[str]:
+    """Returns the token and every string produced by removing a single character from it."""
+    variants = {token[:i] + token[i + 1:] for i in range(len(token))}
+    variants.add(token)
+    return variants
+
 
 def setup(client):
     pass
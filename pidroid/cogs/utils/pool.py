@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util import LRUCache # type: ignore
+from typing import Any, List, Optional, Tuple, Type
+
+# Upper bounds of connection wait time histogram buckets, in seconds
+WAIT_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+class PoolStatistics:
+    """This class keeps track of database connection pool statistics."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.wait_buckets = [0] * (len(WAIT_TIME_BUCKETS) + 1)
+
+        self.statement_hits = 0
+        self.statement_misses = 0
+
+    def record_wait(self, seconds: float) -> None:
+        """Records how long it took to acquire a connection from the pool."""
+        self.checkouts += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+        for i, bound in enumerate(WAIT_TIME_BUCKETS):
+            if seconds < bound:
+                self.wait_buckets[i] += 1
+                return
+        self.wait_buckets[-1] += 1
+
+    def record_statement(self, hit: bool) -> None:
+        """Records a prepared statement cache lookup."""
+        if hit:
+            self.statement_hits += 1
+        else:
+            self.statement_misses += 1
+
+    @property
+    def average_wait(self) -> float:
+        """Returns the average connection wait time in seconds."""
+        if self.checkouts == 0:
+            return 0.0
+        return self.total_wait / self.checkouts
+
+    @property
+    def statement_hit_rate(self) -> Optional[float]:
+        """Returns the ratio of prepared statement cache hits, if any statements were executed."""
+        lookups = self.statement_hits + self.statement_misses
+        if lookups == 0:
+            return None
+        return self.statement_hits / lookups
+
+    @property
+    def wait_histogram(self) -> List[Tuple[str, int]]:
+        """Returns a list of wait time bucket labels and connection checkout counts."""
+        labels = [f"<{bound * 1000:g}ms" for bound in WAIT_TIME_BUCKETS]
+        labels.append(f">={WAIT_TIME_BUCKETS[-1] * 1000:g}ms")
+        return list(zip(labels, self.wait_buckets))
+
+def create_instrumented_pool_class(statistics: PoolStatistics) -> Type[AsyncAdaptedQueuePool]:
+    """Returns a connection pool class which records connection wait times to the statistics object."""
+
+    class InstrumentedPool(AsyncAdaptedQueuePool):
+
+        def _do_get(self) -> Any:
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                statistics.record_wait(time.perf_counter() - start)
+
+    return InstrumentedPool
+
+def instrument_statement_cache(engine: Engine, statistics: PoolStatistics) -> None:
+    """Replaces prepared statement caches of new asyncpg connections with ones that record their hit rate."""
+
+    class InstrumentedStatementCache(LRUCache):
+
+        def __contains__(self, key: Any) -> bool:
+            hit = super().__contains__(key)
+            statistics.record_statement(hit)
+            return hit
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        cache = getattr(dbapi_connection, "_prepared_statement_cache", None)
+        if cache is not None:
+            dbapi_connection._prepared_statement_cache = InstrumentedStatementCache(cache.capacity)
@@ -1,6 +1,5 @@
 # pyright: reportMissingImports=false
 
-import aiohttp
 import asyncio
 import os
 import sys
@@ -14,6 +13,7 @@ sys.path.append(os.getcwd())
 
 from pidroid.client import Pidroid
 from pidroid.constants import DATA_FILE_PATH, TEMPORARY_FILE_PATH
+from pidroid.cogs.utils.http import create_client_session
 
 # Use uvloop if possible
 try:
@@ -48,12 +48,21 @@ def config_from_env() -> dict:
     prefix_string = os.environ.get("PREFIXES", "P, p, TT")
     prefixes = [p.strip() for p in prefix_string.split(",")]
 
+    pool_size = int(os.environ.get("POSTGRES_POOL_SIZE") or 5)
+
     return {
         "token": os.environ["TOKEN"],
         "prefixes": prefixes,
 
         "mongo_dsn": os.environ["MONGO_DSN"],
         "postgres_dsn": os.environ.get("POSTGRES_DSN"),
+        "postgres_pool_size": pool_size,
+        "postgres_max_overflow": int(os.environ.get("POSTGRES_MAX_OVERFLOW") or 10),
+        "postgres_pool_timeout": float(os.environ.get("POSTGRES_POOL_TIMEOUT") or 30),
+        "postgres_pool_recycle": int(os.environ.get("POSTGRES_POOL_RECYCLE") or -1),
+        "postgres_pool_pre_ping": (os.environ.get("POSTGRES_POOL_PRE_PING") or "false").lower() in ("1", "true", "yes"),
+        "postgres_pool_warmup": int(os.environ.get("POSTGRES_POOL_WARMUP") or pool_size),
+        "postgres_statement_cache_size": int(os.environ.get("POSTGRES_STATEMENT_CACHE_SIZE") or 100),
 
         "tt_api_key": os.environ.get("TT_API_KEY"),
         "deepl_api_key": os.environ.get("DEEPL_API_KEY"),
@@ -98,7 +107,7 @@ async def main():  # noqa: C901
         except Exception as e:
             await ctx.reply(f'The following exception occurred while trying to reload the bot:\n```{e}```')
 
-    async with aiohttp.ClientSession() as session:
+    async with create_client_session(bot.outbound_statistics) as session:
         async with bot:
             bot.session = session
             await bot.start(bot.token)
@@ -0,0 +1,109 @@
+"""
+Compares peak memory usage and latency of Pidroid's memefy command when images are decoded
+at full resolution against decoding them at the target scale, using generated phone photos.
+
+Usage:
+    python scripts/benchmark_images.py
+
+Every case is run in a fresh process. Peak memory usage is read from /proc, so the script only runs on Linux.
+"""
+
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Callable, Dict, Tuple
+
+from PIL import Image, ImageFilter
+
+sys.path.append(os.getcwd())
+
+from pidroid.cogs.utils.images import encode_image, open_image, render_memefy # noqa: E402
+
+# Sizes of photos taken by common phone cameras
+PHOTO_SIZES: Dict[str, Tuple[int, int]] = {
+    "8 MP": (3264, 2448),
+    "12 MP": (4032, 3024),
+    "20 MP": (5472, 3648),
+}
+
+def generate_photo(size: Tuple[int, int], format: str) -> bytes:
+    """Returns a photo-like image, with smooth gradients and sensor noise, encoded like a phone camera would."""
+    width, height = size
+    gradient = Image.linear_gradient("L").resize(size)
+    noise = Image.effect_noise((width // 4, height // 4), 24).resize(size).filter(ImageFilter.GaussianBlur(2))
+    img = Image.merge("RGB", (gradient, noise, gradient.transpose(Image.FLIP_LEFT_RIGHT)))
+    output = BytesIO()
+    if format == "JPEG":
+        img.save(output, format="JPEG", quality=85)
+    else:
+        img.save(output, format="PNG", compress_level=1)
+    return output.getvalue()
+
+def render_memefy_full(data: bytes, retain_aspect: bool) -> bytes:
+    """Renders memefy output by decoding the whole image at full resolution."""
+    img = open_image(data)
+    sizes = (128, 128)
+    if retain_aspect:
+        orig_w, orig_h = img.size
+        sizes = (128, max(1, round(orig_h * 128 / orig_w)))
+    resized = img.resize(sizes, Image.LANCZOS)
+    img.close()
+    return encode_image(resized, 'png')
+
+# Aspect ratio modes which memefy command is benchmarked with
+CASES: Dict[str, tuple] = {
+    "stretch": (False,),
+    "aspect": (True,),
+}
+
+def read_memory_status(field: str) -> int:
+    """Returns the specified memory field of the current process in kilobytes."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+def measure(function: Callable[..., bytes], data: bytes, args: tuple, runs: int) -> Tuple[float, float]:
+    """Returns the median latency in milliseconds and the peak memory growth in megabytes."""
+    # Resets the peak resident set size, which is otherwise inherited from the parent process
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+    baseline = read_memory_status("VmRSS")
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function(data, *args)
+        timings.append((time.perf_counter() - start) * 1000)
+    peak = read_memory_status("VmHWM")
+    return statistics.median(timings), (peak - baseline) / 1024
+
+def main():
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument("--runs", type=int, default=5, help="amount of times each case is rendered")
+    arg_parser.add_argument("--format", choices=["JPEG", "PNG"], default="JPEG", help="format of the generated photos")
+    args = arg_parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'Photo':<8} {'Mode':<8} {'Size (MB)':>10} {'Full (ms)':>10} {'Scaled (ms)':>12} {'Full (MB)':>10} {'Scaled (MB)':>12}")
+    for photo_name, size in PHOTO_SIZES.items():
+        data = generate_photo(size, args.format)
+        for mode, mode_args in CASES.items():
+            results = []
+            for function in (render_memefy_full, render_memefy):
+                with ProcessPoolExecutor(1, mp_context=context) as executor:
+                    results.append(executor.submit(measure, function, data, mode_args, args.runs).result())
+            (full_time, full_memory), (scaled_time, scaled_memory) = results
+            print(
+                f"{photo_name:<8} {mode:<8} {len(data) / 1_000_000:>10.1f} "
+                f"{full_time:>10.1f} {scaled_time:>12.1f} {full_memory:>10.1f} {scaled_memory:>12.1f}"
+            )
+
+if __name__ == "__main__":
+    main()